@@ -2,12 +2,8 @@ from datetime import date
 from core.kesalahan import AppError
 from domain.enumerasi import Role, RegistrationStatus, PaymentMethod
 from infrastruktur.penyimpanan_json import JsonStore
-from infrastruktur.repositori import UserRepo, CompetitionRepo, RegistrationRepo, ScheduleRepo, ScoreRepo
-from services.auth_service import AuthService
-from services.registration_service import RegistrationService
-from services.schedule_service import ScheduleService
-from services.scoring_service import ScoringService
-from app.data_awal import seed_all
+from app.data_awal import prepare_store
+from app.konteks import build_context
 
 def _input_int(prompt: str) -> int:
     try:
@@ -21,18 +17,16 @@ def _pause():
 
 def run_app():
     store = JsonStore()
-    seed_all(store)
+    prepare_store(store)
 
-    users = UserRepo(store)
-    comp_repo = CompetitionRepo(store)
-    regs = RegistrationRepo(store)
-    slots = ScheduleRepo(store)
-    scores = ScoreRepo(store)
+    ctx = build_context(store)
+    users = ctx.users
+    comp_repo = ctx.comp_repo
 
-    auth_service = AuthService(users)
-    reg_service = RegistrationService(users, comp_repo, regs)
-    sched_service = ScheduleService(regs, slots)
-    score_service = ScoringService(regs, scores, users)
+    auth_service = ctx.auth_service
+    reg_service = ctx.reg_service
+    sched_service = ctx.sched_service
+    score_service = ctx.score_service
 
     print("=== SELAMAT DATANG DI SISTEM LOMBA NYANYI ===")
     
@@ -1,39 +1,64 @@
-from domain.model import Competition, Category
-from infrastruktur.repositori import CompetitionRepo, UserRepo
 from infrastruktur.penyimpanan_json import JsonStore
 from domain.enumerasi import Role
-from core.keamanan import hash_password
+
+# naikkan setiap kali data seed di bawah berubah
+SEED_VERSION = 1
+
+def _seed_competition():
+    from domain.model import Competition, Category
+    return Competition(
+        id="comp_0001",
+        name="Lomba Nyanyi Nasional",
+        location="Jakarta",
+        date="2026-02-01",
+        deadline="2026-01-20",
+        categories={
+            "cat_anak": Category(id="cat_anak", name="Anak (7-12)", min_age=7, max_age=12, fee=50000, quota=50),
+            "cat_remaja": Category(id="cat_remaja", name="Remaja (13-17)", min_age=13, max_age=17, fee=75000, quota=50),
+            "cat_dewasa": Category(id="cat_dewasa", name="Dewasa (18-35)", min_age=18, max_age=35, fee=100000, quota=50),
+        }
+    )
+
+SEED_USERS = [
+    ("organizer", "organizer123", Role.ORGANIZER),
+    ("judge", "judge123", Role.JUDGE),
+]
 
 def seed_all(store: JsonStore):
-    db = store.read()
-    if db.get("competition") is None:
-        comp_repo = CompetitionRepo(store)
-        comp = Competition(
-            id="comp_0001",
-            name="Lomba Nyanyi Nasional",
-            location="Jakarta",
-            date="2026-02-01",
-            deadline="2026-01-20",
-            categories={
-                "cat_anak": Category(id="cat_anak", name="Anak (7-12)", min_age=7, max_age=12, fee=50000, quota=50),
-                "cat_remaja": Category(id="cat_remaja", name="Remaja (13-17)", min_age=13, max_age=17, fee=75000, quota=50),
-                "cat_dewasa": Category(id="cat_dewasa", name="Dewasa (18-35)", min_age=18, max_age=35, fee=100000, quota=50),
-            }
-        )
-        comp_repo.set_competition(comp)
-
-    users_repo = UserRepo(store)
-    def add_user(username: str, password: str, role: Role):
-        if users_repo.find_by_username(username):
-            return
-        ph = hash_password(password)
-        uid = users_repo.next_id()
-        current_db = store.read()
-        current_db["users"].append({
-            "id": uid, "username": username, "password_salt_hex": ph.salt_hex, 
-            "password_hash_hex": ph.hash_hex, "role": role.value
-        })
-        store.write(current_db)
-
-    add_user("organizer", "organizer123", Role.ORGANIZER)
-    add_user("judge", "judge123", Role.JUDGE)
\ No newline at end of file
+    """Satu kali baca, paling banyak satu kali tulis; dilewati bila penanda versi cocok."""
+    if store.read_path(("__seed_version",)) == SEED_VERSION:
+        return
+    with store.session():
+        db = store.read()
+
+        from infrastruktur.repositori import CompetitionRepo, IdGenerator
+        if not db.get("competitions"):
+            CompetitionRepo(store).set_competition(_seed_competition())
+            db = store.read()
+
+        existing = {u["username"] for u in db["users"]}
+        missing = [(u, p, r) for u, p, r in SEED_USERS if u not in existing]
+        if missing:
+            from core.keamanan import hash_password
+            ids = IdGenerator("user")
+            for username, password, role in missing:
+                ph = hash_password(password)
+                db["users"].append({
+                    "id": ids.new_id(db), "username": username, "password_salt_hex": ph.salt_hex,
+                    "password_hash_hex": ph.hash_hex, "role": role.value
+                })
+
+        db["__seed_version"] = SEED_VERSION
+        store.write(db)
+
+def prepare_store(store: JsonStore):
+    """Dipanggil sekali saat startup: upgrade skema bila perlu, lalu seed."""
+    from core.konstanta import SCHEMA_VERSION
+    # versi dicek lewat indeks milik store, yang juga dipakai seed_all:
+    # db yang sudah terbaru cukup dipindai sekali
+    if store.read_path(("__schema_version",), 0) < SCHEMA_VERSION:
+        from infrastruktur.migrasi import migrate
+        # migrate mengganti db.json, dan di Windows file yang masih ter-mmap tidak bisa diganti
+        store.release()
+        migrate(store.path)
+    seed_all(store)
@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from typing import Optional
+from infrastruktur.penyimpanan_json import JsonStore
+from infrastruktur.repositori import UserRepo, CompetitionRepo, RegistrationRepo, ScheduleRepo, ScoreRepo, EventRepo
+from services.auth_service import AuthService
+from services.registration_service import RegistrationService
+from services.schedule_service import ScheduleService
+from services.scoring_service import ScoringService
+
+@dataclass
+class AppContext:
+    store: JsonStore
+    users: UserRepo
+    comp_repo: CompetitionRepo
+    regs: RegistrationRepo
+    slots: ScheduleRepo
+    scores: ScoreRepo
+    events: EventRepo
+    auth_service: AuthService
+    reg_service: RegistrationService
+    sched_service: ScheduleService
+    score_service: ScoringService
+    competition_id: Optional[str] = None
+
+    def for_competition(self, competition_id: Optional[str]) -> "AppContext":
+        if competition_id == self.competition_id:
+            return self
+        return build_context(self.store, competition_id)
+
+def build_context(store: JsonStore, competition_id: Optional[str] = None) -> AppContext:
+    """`competition_id` None berarti selalu mengikuti kompetisi aktif."""
+    users = UserRepo(store)
+    comp_repo = CompetitionRepo(store, competition_id)
+    regs = RegistrationRepo(store, competition_id)
+    slots = ScheduleRepo(store, competition_id)
+    scores = ScoreRepo(store, competition_id)
+    return AppContext(
+        store=store,
+        users=users,
+        comp_repo=comp_repo,
+        regs=regs,
+        slots=slots,
+        scores=scores,
+        events=EventRepo(store),
+        auth_service=AuthService(users),
+        reg_service=RegistrationService(users, comp_repo, regs),
+        sched_service=ScheduleService(regs, slots),
+        score_service=ScoringService(regs, scores, users),
+        competition_id=competition_id,
+    )
@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from infrastruktur.penyimpanan_json import JsonStore
+from app.konteks import build_context
+from app.operasi import get_operasi, run_op
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_GROUP = 64
+
+class AsyncLayanan:
+    """Fasad asyncio di atas service yang ada.
+
+    Operasi baca (termasuk login/hash password) jalan di thread pool
+    berukuran tetap; begitu juga langkah `prepare` operasi tulis (hash
+    password saat register), sebelum operasinya diantrikan. Operasi
+    tulis diantrikan ke satu writer task yang mengambil semua tulisan
+    yang sedang menunggu, menjalankannya dalam satu sesi store, lalu
+    commit sekali (group commit).
+    """
+
+    def __init__(self, store: JsonStore, workers: int = DEFAULT_WORKERS, max_group: int = DEFAULT_MAX_GROUP):
+        self.store = store
+        self.ctx = build_context(store)
+        self.max_group = max_group
+        self._readers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lomba-baca")
+        self._writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lomba-tulis")
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+
+    async def stop(self) -> None:
+        if self._writer_task is not None:
+            await self._queue.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        self._readers.shutdown(wait=True)
+        self._writer_pool.shutdown(wait=True)
+
+    async def execute(self, op: Dict[str, Any]) -> Dict[str, Any]:
+        """Jalankan satu operasi (format sama dengan mode batch)."""
+        try:
+            op_def = get_operasi(op.get("op", ""))
+        except Exception:
+            op_def = None
+        loop = asyncio.get_running_loop()
+        if op_def is None or not op_def.writes:
+            return await loop.run_in_executor(self._readers, run_op, self.ctx, op)
+        if self._queue is None:
+            raise RuntimeError("AsyncLayanan belum di-start()")
+        if op_def.prepare is not None:
+            # bagian CPU-berat tidak menahan satu-satunya thread penulis
+            op = await loop.run_in_executor(self._readers, op_def.prepare, op)
+        fut = loop.create_future()
+        await self._queue.put((op, fut))
+        return await fut
+
+    async def _writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            group = [await self._queue.get()]
+            while len(group) < self.max_group:
+                try:
+                    group.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                results = await loop.run_in_executor(self._writer_pool, self._apply_group, [op for op, _ in group])
+                for (_, fut), res in zip(group, results):
+                    if not fut.done():
+                        fut.set_result(res)
+            except Exception as e:
+                for _, fut in group:
+                    if not fut.done():
+                        fut.set_exception(e)
+            finally:
+                for _ in group:
+                    self._queue.task_done()
+
+    def _apply_group(self, ops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        with self.store.session():
+            return [run_op(self.ctx, op) for op in ops]
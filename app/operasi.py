@@ -0,0 +1,208 @@
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import date
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Type
+from core.kesalahan import AppError, ValidationError
+from core.keamanan import PasswordHash, hash_password
+from domain.enumerasi import RegistrationStatus, PaymentMethod
+from domain.model import Category, Competition
+from app.konteks import AppContext
+
+Handler = Callable[[AppContext, Dict[str, Any]], Any]
+Prepare = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+@dataclass(frozen=True)
+class Operasi:
+    handler: Handler
+    writes: bool
+    # langkah berat tanpa akses store (mis. hash password) yang boleh
+    # dijalankan lebih dulu di thread pembaca sebelum operasi tulis diantrikan
+    prepare: Optional[Prepare] = None
+    # argumennya rahasia (password): jangan diterima lewat query string GET
+    post_only: bool = False
+
+def to_jsonable(obj: Any) -> Any:
+    if is_dataclass(obj):
+        return asdict(obj)
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(o) for o in obj]
+    return obj
+
+def _arg(args: Dict[str, Any], name: str) -> Any:
+    if name not in args:
+        raise ValidationError(f"argumen '{name}' wajib diisi")
+    return args[name]
+
+# konversi argumen: input yang salah jadi ValidationError di sini, supaya
+# ValueError lain (mis. db rusak) tetap dilaporkan sebagai kesalahan sistem
+def _int(args: Dict[str, Any], name: str, default: Optional[int] = None) -> int:
+    raw = _arg(args, name) if default is None else args.get(name, default)
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise ValidationError(f"argumen '{name}' harus bilangan bulat")
+
+def _enum(cls: Type[Enum], args: Dict[str, Any], name: str) -> Any:
+    raw = _arg(args, name)
+    try:
+        return cls(raw)
+    except ValueError:
+        raise ValidationError(f"argumen '{name}' tidak valid: {raw}")
+
+def _today(args: Dict[str, Any]) -> date:
+    raw = args.get("today")
+    if not raw:
+        return date.today()
+    try:
+        return date.fromisoformat(raw)
+    except (TypeError, ValueError):
+        raise ValidationError("argumen 'today' harus YYYY-MM-DD")
+
+def _public_user(user) -> Dict[str, Any]:
+    d = asdict(user)
+    del d["password_salt_hex"], d["password_hash_hex"]
+    return d
+
+def _login(ctx: AppContext, args: Dict[str, Any]):
+    return _public_user(ctx.auth_service.login(_arg(args, "username"), _arg(args, "password")))
+
+def _prepare_register(args: Dict[str, Any]) -> Dict[str, Any]:
+    if not args.get("password"):
+        return args
+    return {**args, "_password_hash": hash_password(args["password"])}
+
+def _register(ctx: AppContext, args: Dict[str, Any]):
+    ph = args.get("_password_hash")
+    p = ctx.auth_service.register_participant(
+        _arg(args, "username"), _arg(args, "password"),
+        args.get("full_name", ""), _int(args, "age", 0), args.get("phone", ""),
+        password_hash=ph if isinstance(ph, PasswordHash) else None
+    )
+    return _public_user(p)
+
+def _create_registration(ctx: AppContext, args: Dict[str, Any]):
+    return ctx.reg_service.create_registration(
+        _arg(args, "participant_id"), _arg(args, "category_id"),
+        _arg(args, "song_title"), args.get("song_creator", ""),
+        args.get("media_link", ""), _today(args)
+    )
+
+def _submit(ctx: AppContext, args: Dict[str, Any]):
+    return ctx.reg_service.submit(_arg(args, "reg_id"), _arg(args, "participant_id"))
+
+def _pay(ctx: AppContext, args: Dict[str, Any]):
+    return ctx.reg_service.pay(
+        _arg(args, "reg_id"), _arg(args, "participant_id"),
+        _enum(PaymentMethod, args, "method"), args.get("proof", "")
+    )
+
+def _verify(ctx: AppContext, args: Dict[str, Any]):
+    return ctx.reg_service.organizer_verify(_arg(args, "reg_id"))
+
+def _schedule(ctx: AppContext, args: Dict[str, Any]):
+    return ctx.sched_service.assign_manual_slot(
+        _arg(args, "reg_id"), _arg(args, "date_time"),
+        args.get("stage") or "Main Stage", _int(args, "order_no")
+    )
+
+def _score(ctx: AppContext, args: Dict[str, Any]):
+    return ctx.score_service.submit_score(
+        _arg(args, "reg_id"), _arg(args, "judge_id"),
+        _int(args, "vocal"), _int(args, "intonation"), _int(args, "stage")
+    )
+
+def _my_registrations(ctx: AppContext, args: Dict[str, Any]):
+    return ctx.reg_service.list_my_regs(_arg(args, "participant_id"))
+
+def _list_by_status(ctx: AppContext, args: Dict[str, Any]):
+    return ctx.reg_service.list_by_status(_enum(RegistrationStatus, args, "status"))
+
+def _list_slots(ctx: AppContext, args: Dict[str, Any]):
+    return ctx.sched_service.list_all_slots()
+
+def _events(ctx: AppContext, args: Dict[str, Any]):
+    limit = _int(args, "limit") if args.get("limit") is not None else None
+    return ctx.events.since(_int(args, "since", 0), limit)
+
+def _competitions(ctx: AppContext, args: Dict[str, Any]):
+    active = ctx.comp_repo.active_id()
+    return [{**asdict(c), "active": c.id == active} for c in ctx.comp_repo.list_competitions()]
+
+def _create_competition(ctx: AppContext, args: Dict[str, Any]):
+    raw_cats = _arg(args, "categories")
+    if not isinstance(raw_cats, dict) or not raw_cats:
+        raise ValidationError("categories harus berupa objek {id: {...}}")
+    comp = Competition(
+        id=args.get("competition_id") or ctx.comp_repo.next_id(),
+        name=_arg(args, "name"),
+        location=args.get("location", ""),
+        date=_arg(args, "date"),
+        deadline=_arg(args, "deadline"),
+        categories={cid: Category(**{**c, "id": cid}) for cid, c in raw_cats.items()},
+    )
+    ctx.comp_repo.set_competition(comp)
+    if args.get("activate"):
+        ctx.comp_repo.set_active(comp.id)
+    return comp
+
+def _activate(ctx: AppContext, args: Dict[str, Any]):
+    ctx.comp_repo.set_active(_arg(args, "competition_id"))
+    return {"active_competition": args["competition_id"]}
+
+def _archive(ctx: AppContext, args: Dict[str, Any]):
+    ctx.comp_repo.archive(_arg(args, "competition_id"))
+    return {"archived": args["competition_id"]}
+
+def _ranking(ctx: AppContext, args: Dict[str, Any]):
+    return [
+        {"rank": idx, "reg_id": reg_id, "name": name, "score": avg, "judges": count}
+        for idx, (reg_id, name, avg, count) in enumerate(ctx.score_service.ranking(), start=1)
+    ]
+
+OPERASI: Dict[str, Operasi] = {
+    "login": Operasi(_login, writes=False, post_only=True),
+    "register": Operasi(_register, writes=True, prepare=_prepare_register),
+    "create_registration": Operasi(_create_registration, writes=True),
+    "submit": Operasi(_submit, writes=True),
+    "pay": Operasi(_pay, writes=True),
+    "verify": Operasi(_verify, writes=True),
+    "schedule": Operasi(_schedule, writes=True),
+    "score": Operasi(_score, writes=True),
+    "my_registrations": Operasi(_my_registrations, writes=False),
+    "list_by_status": Operasi(_list_by_status, writes=False),
+    "slots": Operasi(_list_slots, writes=False),
+    "ranking": Operasi(_ranking, writes=False),
+    "events": Operasi(_events, writes=False),
+    "competitions": Operasi(_competitions, writes=False),
+    "create_competition": Operasi(_create_competition, writes=True),
+    "activate": Operasi(_activate, writes=True),
+    "archive": Operasi(_archive, writes=True),
+}
+
+def get_operasi(name: str) -> Operasi:
+    op = OPERASI.get(name)
+    if op is None:
+        raise ValidationError(f"operasi '{name}' tidak dikenal")
+    return op
+
+def run_op(ctx: AppContext, op: Dict[str, Any]) -> Dict[str, Any]:
+    name = op.get("op", "")
+    out: Dict[str, Any] = {"op": name}
+    if "id" in op:
+        out["id"] = op["id"]
+    try:
+        if "parse_error" in op:
+            raise ValidationError(f"baris bukan JSON valid: {op['parse_error']}")
+        # "competition_id" memilih partisi kompetisi lain; default kompetisi aktif
+        result = get_operasi(name).handler(ctx.for_competition(op.get("competition_id")), op)
+        out["status"] = "ok"
+        out["result"] = to_jsonable(result)
+    except AppError as e:
+        out["status"] = "error"
+        out["error"] = str(e)
+        out["error_type"] = type(e).__name__
+    except Exception as e:
+        out["status"] = "error"
+        out["error"] = f"kesalahan sistem: {e}"
+        out["error_type"] = type(e).__name__
+    return out
@@ -0,0 +1,144 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+from infrastruktur.penyimpanan_json import JsonStore
+from app.data_awal import prepare_store
+from app.konteks import build_context
+from infrastruktur.repositori import EventRepo
+from app.operasi import OPERASI, run_op, to_jsonable
+
+DEFAULT_BATCH_SIZE = 100
+
+def run_batch(store: JsonStore, ops: Iterable[Dict[str, Any]], out: TextIO, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """Jalankan operasi dalam satu sesi store; commit tiap `batch_size` operasi tulis."""
+    ctx = build_context(store)
+    summary = {"ok": 0, "error": 0, "commits": 0}
+    pending = 0
+    with store.session():
+        for line_no, op in enumerate(ops, start=1):
+            res = run_op(ctx, op)
+            res["line"] = line_no
+            summary[res["status"]] += 1
+            out.write(json.dumps(res, ensure_ascii=False) + "\n")
+
+            op_def = OPERASI.get(res["op"])
+            if op_def and op_def.writes:
+                pending += 1
+            if pending >= batch_size:
+                summary["commits"] += store.commit()
+                pending = 0
+        if pending:
+            summary["commits"] += store.commit()
+    return summary
+
+def _parse_lines(lines: Iterable[str]) -> Iterable[Dict[str, Any]]:
+    for raw in lines:
+        raw = raw.strip()
+        if not raw or raw.startswith("#"):
+            continue
+        try:
+            op = json.loads(raw)
+        except json.JSONDecodeError as e:
+            op = {"op": "", "parse_error": str(e)}
+        if not isinstance(op, dict):
+            op = {"op": "", "parse_error": "harus berupa objek JSON"}
+        yield op
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="Mode perintah non-interaktif (output JSON per baris).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("batch", help="jalankan operasi dari file JSONL ('-' untuk stdin)")
+    p.add_argument("file")
+    p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    p = sub.add_parser("verify", help="verifikasi pembayaran pendaftaran")
+    p.add_argument("reg_ids", nargs="+")
+
+    p = sub.add_parser("schedule", help="atur jadwal manual")
+    p.add_argument("reg_id")
+    p.add_argument("--at", dest="date_time", required=True)
+    p.add_argument("--stage", default="Main Stage")
+    p.add_argument("--order", dest="order_no", type=int, required=True)
+
+    p = sub.add_parser("score", help="beri nilai")
+    p.add_argument("reg_id")
+    p.add_argument("--judge", dest="judge_id", required=True)
+    p.add_argument("--vocal", type=int, required=True)
+    p.add_argument("--intonation", type=int, required=True)
+    p.add_argument("--stage", type=int, required=True)
+
+    sub.add_parser("ranking", help="tampilkan ranking sementara")
+
+    p = sub.add_parser("events", help="tampilkan event perubahan setelah nomor urut tertentu")
+    p.add_argument("--since", type=int, default=0)
+    p.add_argument("--follow", action="store_true", help="terus tunggu event baru")
+
+    sub.add_parser("migrate", help="upgrade skema db ke versi terbaru")
+
+    for name, help_ in (("check", "periksa konsistensi data (output JSON)"), ("repair", "periksa lalu perbaiki otomatis dalam satu commit")):
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("--workers", type=int, default=None, help="jumlah proses pemeriksa (default: jumlah CPU)")
+
+    p = sub.add_parser("serve", help="jalankan server HTTP/JSON lokal")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--workers", type=int, default=4)
+    return parser
+
+def _ops_from_args(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    if args.command == "verify":
+        return [{"op": "verify", "reg_id": rid} for rid in args.reg_ids]
+    if args.command == "schedule":
+        return [{"op": "schedule", "reg_id": args.reg_id, "date_time": args.date_time, "stage": args.stage, "order_no": args.order_no}]
+    if args.command == "score":
+        return [{"op": "score", "reg_id": args.reg_id, "judge_id": args.judge_id, "vocal": args.vocal, "intonation": args.intonation, "stage": args.stage}]
+    if args.command == "events":
+        return [{"op": "events", "since": args.since}]
+    return [{"op": args.command}]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.command == "serve":
+        from app.server_http import run_server
+        run_server(args.host, args.port, args.workers)
+        return 0
+
+    store = JsonStore()
+    if args.command == "migrate":
+        from infrastruktur.migrasi import migrate
+        done = migrate(store.path)
+        print(json.dumps({"from": done[0], "to": done[1]} if done else {"status": "up-to-date"}))
+        return 0
+    prepare_store(store)
+
+    if args.command in ("check", "repair"):
+        from services.consistency_service import ConsistencyService, to_report
+        checker = ConsistencyService(store, workers=args.workers)
+        violations = checker.repair() if args.command == "repair" else checker.check()
+        print(json.dumps(to_report(violations), ensure_ascii=False, indent=2))
+        return 0 if all(v.fixed for v in violations) else 1
+
+    if args.command == "events" and args.follow:
+        try:
+            for e in EventRepo(store).tail(args.since):
+                print(json.dumps(to_jsonable(e), ensure_ascii=False), flush=True)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "batch":
+        if args.batch_size < 1:
+            print("--batch-size minimal 1", file=sys.stderr)
+            return 2
+        if args.file == "-":
+            summary = run_batch(store, _parse_lines(sys.stdin), sys.stdout, args.batch_size)
+        else:
+            with open(args.file, "r", encoding="utf-8") as f:
+                summary = run_batch(store, _parse_lines(f), sys.stdout, args.batch_size)
+    else:
+        summary = run_batch(store, _ops_from_args(args), sys.stdout)
+
+    print(json.dumps({"summary": summary}), file=sys.stderr)
+    return 0 if summary["error"] == 0 else 1
@@ -0,0 +1,153 @@
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from infrastruktur.penyimpanan_json import JsonStore
+from app.data_awal import prepare_store
+from app.layanan_async import AsyncLayanan, DEFAULT_WORKERS
+from app.operasi import OPERASI
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_BODY = 1024 * 1024
+
+_STATUS_BY_ERROR = {
+    "ValidationError": HTTPStatus.BAD_REQUEST,
+    "TransitionError": HTTPStatus.BAD_REQUEST,
+    "AuthError": HTTPStatus.UNAUTHORIZED,
+    "NotFoundError": HTTPStatus.NOT_FOUND,
+    "ConflictError": HTTPStatus.CONFLICT,
+}
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+class ServerHttp:
+    """Server HTTP/JSON minimal (stdlib asyncio) untuk localhost.
+
+    GET  /ops/<nama>?arg=..   operasi baca (ranking, list_by_status, ...), kecuali login
+    POST /ops/<nama>          operasi baca/tulis, argumen di body JSON
+    GET  /health
+    """
+
+    def __init__(self, layanan: AsyncLayanan):
+        self.layanan = layanan
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    status, payload = await self._dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, {"status": "error", "error": str(e)}
+                except Exception as e:
+                    # mis. group commit gagal: klien tetap mendapat jawaban
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    payload = {"status": "error", "error": f"kesalahan sistem: {e}", "error_type": type(e).__name__}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HttpError as e:
+            self._write_response(writer, e.status, {"status": "error", "error": str(e)}, False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "request line tidak valid")
+        headers: Dict[str, str] = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = h.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "content-length tidak valid")
+        if length < 0:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "content-length tidak valid")
+        if length > MAX_BODY:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "body terlalu besar")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, Any]:
+        url = urlsplit(target)
+        if url.path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        if not url.path.startswith("/ops/"):
+            raise HttpError(HTTPStatus.NOT_FOUND, "path tidak dikenal")
+
+        name = url.path[len("/ops/"):]
+        op_def = OPERASI.get(name)
+        if op_def is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"operasi '{name}' tidak dikenal")
+
+        if method == "GET":
+            if op_def.writes:
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "operasi tulis harus lewat POST")
+            if op_def.post_only:
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"operasi '{name}' harus lewat POST")
+            args: Dict[str, Any] = dict(parse_qsl(url.query))
+        elif method == "POST":
+            try:
+                args = json.loads(body or b"{}")
+            except json.JSONDecodeError:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "body bukan JSON valid")
+            if not isinstance(args, dict):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "body harus berupa objek JSON")
+        else:
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "method tidak didukung")
+
+        res = await self.layanan.execute({**args, "op": name})
+        if res["status"] == "ok":
+            return HTTPStatus.OK, res
+        return _STATUS_BY_ERROR.get(res.get("error_type", ""), HTTPStatus.INTERNAL_SERVER_ERROR), res
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: HTTPStatus, payload: Any, keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+async def serve(store: JsonStore, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS) -> None:
+    layanan = AsyncLayanan(store, workers=workers)
+    await layanan.start()
+    server = await asyncio.start_server(ServerHttp(layanan).handle, host, port)
+    print(f"Server berjalan di http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await layanan.stop()
+
+def run_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS) -> None:
+    store = JsonStore()
+    prepare_store(store)
+    try:
+        asyncio.run(serve(store, host, port, workers))
+    except KeyboardInterrupt:
+        pass
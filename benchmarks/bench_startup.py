@@ -0,0 +1,74 @@
+"""Benchmark waktu startup: import modul aplikasi + prepare_store (migrasi + seed).
+
+Jalankan dari root repo:  python benchmarks/bench_startup.py [--runs N]
+"""
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# dijalankan di proses baru supaya import benar-benar dingin
+_STARTUP = """
+import sys, time
+t0 = time.perf_counter()
+import app.baris_perintah
+from app.data_awal import prepare_store
+from infrastruktur.penyimpanan_json import JsonStore
+t1 = time.perf_counter()
+store = JsonStore(__import__("pathlib").Path(sys.argv[1]))
+prepare_store(store)
+t2 = time.perf_counter()
+print(f"{t1 - t0} {t2 - t1}")
+"""
+
+def _run(db_path: Path) -> tuple:
+    out = subprocess.run(
+        [sys.executable, "-c", _STARTUP, str(db_path)],
+        cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout.split()
+    return float(out[0]), float(out[1])
+
+def _report(name: str, samples: list) -> dict:
+    ms = sorted(s * 1000 for s in samples)
+    return {"case": name, "median_ms": round(statistics.median(ms), 3), "min_ms": round(ms[0], 3), "max_ms": round(ms[-1], 3)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        imports, fresh, seeded = [], [], []
+        for i in range(args.runs):
+            db = tmp / f"fresh_{i}.json"
+            imp, seed = _run(db)
+            imports.append(imp)
+            fresh.append(seed)
+
+        db = tmp / "seeded.json"
+        if (ROOT / "data" / "db.json").exists():
+            shutil.copy(ROOT / "data" / "db.json", db)
+        _run(db)
+        for _ in range(args.runs):
+            imp, seed = _run(db)
+            imports.append(imp)
+            seeded.append(seed)
+            mtime = db.stat().st_mtime_ns
+        _run(db)
+        rewrites = int(db.stat().st_mtime_ns != mtime)
+
+        for row in (_report("import", imports), _report("seed_db_baru", fresh), _report("seed_db_sudah_di-seed", seeded)):
+            print(json.dumps(row))
+        print(json.dumps({"case": "tulis_ulang_saat_sudah_di-seed", "writes": rewrites}))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
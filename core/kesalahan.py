@@ -11,4 +11,7 @@ class NotFoundError(AppError):
     pass
 
 class ConflictError(AppError):
-    pass
\ No newline at end of file
+    pass
+
+class TransitionError(ValidationError, ValueError):
+    """Transisi status yang tidak valid; tetap ValueError untuk pemanggil lama."""
\ No newline at end of file
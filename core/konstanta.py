@@ -1,4 +1,7 @@
 from pathlib import Path
 
 DATA_DIR = Path("data")
-DB_PATH = DATA_DIR / "db.json"
\ No newline at end of file
+DB_PATH = DATA_DIR / "db.json"
+
+# naikkan bersama migrasi baru di infrastruktur/migrasi.py
+SCHEMA_VERSION = 2
\ No newline at end of file
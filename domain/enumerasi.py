@@ -16,4 +16,13 @@ class RegistrationStatus(str, Enum):
 class PaymentMethod(str, Enum):
     TRANSFER_BANK = "transfer_bank"
     EWALLET = "ewallet"
-    CASH_ON_SITE = "cash_on_site"
\ No newline at end of file
+    CASH_ON_SITE = "cash_on_site"
+
+class EventType(str, Enum):
+    REGISTRATION_CREATED = "registration_created"
+    REGISTRATION_SUBMITTED = "registration_submitted"
+    REGISTRATION_PAID = "registration_paid"
+    REGISTRATION_VERIFIED = "registration_verified"
+    REGISTRATION_REJECTED = "registration_rejected"
+    REGISTRATION_SCHEDULED = "registration_scheduled"
+    SCORE_UPSERTED = "score_upserted"
\ No newline at end of file
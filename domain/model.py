@@ -1,8 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any
-from domain.enumerasi import Role, RegistrationStatus, PaymentMethod
+from typing import Optional, Dict, Any, List, Tuple
+from core.kesalahan import TransitionError
+from domain.enumerasi import Role, RegistrationStatus, PaymentMethod, EventType
 
 def now_iso() -> str:
     return datetime.utcnow().isoformat()
@@ -42,6 +43,7 @@ class Competition:
     date: str
     deadline: str
     categories: Dict[str, Category]
+    archived: bool = False
 
 @dataclass
 class Payment:
@@ -65,37 +67,58 @@ class Registration:
     rejected_reason: Optional[str] = None
     schedule_slot_id: Optional[str] = None
 
+    def _record(self, event_type: EventType, **payload: Any) -> None:
+        # disimpan di luar field dataclass supaya tidak ikut asdict()
+        self.__dict__.setdefault("_events", []).append((event_type, {"status": self.status.value, **payload}))
+
+    def pull_events(self) -> List[Tuple[EventType, Dict[str, Any]]]:
+        return self.__dict__.pop("_events", [])
+
     def submit(self) -> None:
         if self.status not in (RegistrationStatus.DRAFT,):
-            raise ValueError("status tidak valid untuk submit")
+            raise TransitionError("status tidak valid untuk submit")
         self.status = RegistrationStatus.SUBMITTED
         self.submitted_at = now_iso()
+        self._record(EventType.REGISTRATION_SUBMITTED, submitted_at=self.submitted_at)
 
     def mark_paid(self, payment: Payment) -> None:
         if self.status != RegistrationStatus.SUBMITTED:
-            raise ValueError("pembayaran hanya bisa setelah submitted")
+            raise TransitionError("pembayaran hanya bisa setelah submitted")
         self.payment = payment
         self.status = RegistrationStatus.PAID
+        self._record(EventType.REGISTRATION_PAID, method=payment.method.value, amount=payment.amount)
 
     def verify(self) -> None:
         if self.status != RegistrationStatus.PAID:
-            raise ValueError("verifikasi hanya bisa setelah paid")
+            raise TransitionError("verifikasi hanya bisa setelah paid")
         self.status = RegistrationStatus.VERIFIED
         self.verified_at = now_iso()
         self.rejected_reason = None
+        self._record(EventType.REGISTRATION_VERIFIED, verified_at=self.verified_at)
 
     def reject(self, reason: str) -> None:
         if self.status not in (RegistrationStatus.PAID, RegistrationStatus.SUBMITTED):
-            raise ValueError("reject hanya bisa ketika submitted/paid")
+            raise TransitionError("reject hanya bisa ketika submitted/paid")
         self.status = RegistrationStatus.REJECTED
         self.rejected_reason = reason
         self.verified_at = None
+        self._record(EventType.REGISTRATION_REJECTED, reason=reason)
 
     def schedule(self, slot_id: str) -> None:
         if self.status != RegistrationStatus.VERIFIED:
-            raise ValueError("jadwal hanya untuk verified")
+            raise TransitionError("jadwal hanya untuk verified")
         self.status = RegistrationStatus.SCHEDULED
         self.schedule_slot_id = slot_id
+        self._record(EventType.REGISTRATION_SCHEDULED, schedule_slot_id=slot_id)
+
+@dataclass
+class Event:
+    seq: int
+    type: EventType
+    entity_id: str
+    payload: Dict[str, Any]
+    at: str = field(default_factory=now_iso)
+    competition_id: Optional[str] = None
 
 @dataclass
 class ScheduleSlot:
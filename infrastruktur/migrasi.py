@@ -0,0 +1,216 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from core.konstanta import SCHEMA_VERSION
+from infrastruktur.pembaca_lazy import LazyJsonReader
+
+CHECKPOINT_EVERY = 5000
+
+@dataclass(frozen=True)
+class _ListRef:
+    """Penanda list (koleksi record) di kerangka dokumen; isinya di-stream dari file sumber."""
+    path: Tuple[Any, ...]
+
+DocumentHook = Callable[[Dict[str, Any], LazyJsonReader], None]
+RecordHook = Callable[[str, Dict[str, Any]], Dict[str, Any]]
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    # mengubah kerangka dokumen (semua kecuali isi list) di memori
+    document: Optional[DocumentHook] = None
+    # mengubah satu record; argumen pertama nama koleksi asalnya
+    record: Optional[RecordHook] = None
+
+def _v1_partition(skel: Dict[str, Any], reader: LazyJsonReader) -> None:
+    if "competition" not in skel:
+        return
+    comp = skel.pop("competition")
+    regs = skel.pop("registrations", [])
+    slots = skel.pop("schedule_slots", [])
+    scores = skel.pop("scores", [])
+    skel.update({"competitions": {}, "active_competition": None, "partitions": {}})
+    if not comp:
+        return
+    quota: Dict[str, int] = {}
+    if isinstance(regs, _ListRef):
+        for r in reader.iter_items(regs.path):
+            if r["status"] != "rejected":
+                quota[r["category_id"]] = quota.get(r["category_id"], 0) + 1
+    skel["competitions"][comp["id"]] = comp
+    skel["active_competition"] = comp["id"]
+    skel["partitions"][comp["id"]] = {
+        "registrations": regs, "schedule_slots": slots, "scores": scores, "quota": quota
+    }
+
+def _v2_document(skel: Dict[str, Any], reader: LazyJsonReader) -> None:
+    skel.setdefault("events", [])
+    for comp in skel.get("competitions", {}).values():
+        comp.setdefault("archived", False)
+    for part in skel.get("partitions", {}).values():
+        for name in ("registrations", "schedule_slots", "scores"):
+            part.setdefault(name, [])
+        part.setdefault("quota", {})
+
+def _v2_record(collection: str, rec: Dict[str, Any]) -> Dict[str, Any]:
+    if collection == "users" and rec.get("role") == "participant":
+        prof = rec.get("profile") or {}
+        rec["profile"] = {
+            "full_name": prof.get("full_name", ""),
+            "age": int(prof.get("age", 0)),
+            "phone": prof.get("phone", ""),
+        }
+    elif collection == "registrations":
+        for key in ("submitted_at", "payment", "verified_at", "rejected_reason", "schedule_slot_id"):
+            rec.setdefault(key, None)
+        if rec["payment"]:
+            rec["payment"].setdefault("paid_at", "")
+    elif collection == "scores":
+        rec.setdefault("created_at", "")
+    elif collection == "events":
+        rec.setdefault("competition_id", None)
+    return rec
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "pisahkan data per kompetisi", document=_v1_partition),
+    Migration(2, "lengkapi field opsional di semua record", document=_v2_document, record=_v2_record),
+]
+
+def migrate(path: Path, checkpoint_every: int = CHECKPOINT_EVERY) -> Optional[Tuple[int, int]]:
+    """Upgrade db di `path` ke SCHEMA_VERSION dalam satu pass streaming.
+
+    Record dibaca satu per satu dari file lama dan ditulis ke file
+    sementara; tiap `checkpoint_every` record posisi disimpan, sehingga
+    migrasi yang terputus dilanjutkan dari checkpoint terakhir. Return
+    (versi_lama, versi_baru), atau None bila tidak ada yang perlu diubah.
+    """
+    if not path.exists():
+        return None
+    reader = LazyJsonReader(path)
+    try:
+        start = int(reader.get(("__schema_version",), 0))
+        if start >= SCHEMA_VERSION:
+            return None
+        pending = [m for m in MIGRATIONS if m.version > start]
+        _StreamingMigration(path, reader, start, pending, checkpoint_every).run()
+    finally:
+        reader.close()
+    return start, SCHEMA_VERSION
+
+class _StreamingMigration:
+    def __init__(self, path: Path, reader: LazyJsonReader, start: int, pending: List[Migration], checkpoint_every: int):
+        self.path = path
+        self.reader = reader
+        self.start = start
+        self.pending = pending
+        self.checkpoint_every = checkpoint_every
+        self.out_path = path.with_suffix(".migrasi.tmp")
+        self.ckpt_path = path.with_suffix(".migrasi.json")
+        st = os.stat(path)
+        self.source = [st.st_ino, st.st_size, st.st_mtime_ns]
+        self.count = 0
+        self.resume_at = 0
+        self.resume_offset = 0
+        self.skipping = False
+        self.f = None
+
+    def run(self) -> None:
+        skel = self._skeleton(())
+        for m in self.pending:
+            if m.document:
+                m.document(skel, self.reader)
+        skel["__schema_version"] = SCHEMA_VERSION
+
+        ckpt = self._load_checkpoint()
+        mode = "r+b" if ckpt else "wb"
+        with open(self.out_path, mode) as f:
+            self.f = f
+            if ckpt:
+                self.resume_at, self.resume_offset = ckpt["records"], ckpt["offset"]
+                self.skipping = self.resume_at > 0
+            self._emit(skel)
+            if self.skipping:
+                # checkpoint menunjuk ke posisi yang tidak pernah tercapai
+                self.ckpt_path.unlink(missing_ok=True)
+                raise ValueError("checkpoint migrasi tidak cocok dengan data; jalankan ulang")
+            f.flush()
+            os.fsync(f.fileno())
+        self.reader.close()
+        os.replace(self.out_path, self.path)
+        self.ckpt_path.unlink(missing_ok=True)
+
+    def _skeleton(self, path: Tuple[Any, ...]) -> Any:
+        if self.reader.is_list(path):
+            return _ListRef(path)
+        keys = self.reader.keys(path)
+        if keys is None:
+            return self.reader.get(path)
+        return {k: self._skeleton(path + (k,)) for k in keys}
+
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        try:
+            ckpt = json.loads(self.ckpt_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        valid = (
+            ckpt.get("from") == self.start and ckpt.get("to") == SCHEMA_VERSION
+            and ckpt.get("source") == self.source and self.out_path.exists()
+            and self.out_path.stat().st_size >= ckpt.get("offset", 0)
+        )
+        return ckpt if valid else None
+
+    def _save_checkpoint(self) -> None:
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        tmp = self.ckpt_path.with_name(self.ckpt_path.name + ".tmp")
+        tmp.write_text(json.dumps({
+            "from": self.start, "to": SCHEMA_VERSION, "source": self.source,
+            "records": self.count, "offset": self.f.tell()
+        }), encoding="utf-8")
+        tmp.replace(self.ckpt_path)
+
+    def _write(self, text: str) -> None:
+        if not self.skipping:
+            self.f.write(text.encode("utf-8"))
+
+    def _advance(self, n: int) -> None:
+        # output deterministik: bagian sebelum checkpoint dilewati tanpa
+        # ditulis, lalu penulisan dilanjutkan tepat di offset checkpoint
+        self.count += n
+        if self.skipping and self.count >= self.resume_at:
+            self.skipping = False
+            self.f.seek(self.resume_offset)
+            self.f.truncate()
+
+    def _emit(self, node: Any) -> None:
+        if isinstance(node, _ListRef):
+            self._emit_list(node)
+        elif isinstance(node, dict):
+            self._write("{")
+            for i, (k, v) in enumerate(node.items()):
+                self._write(("," if i else "") + "\n" + json.dumps(k, ensure_ascii=False) + ":")
+                self._emit(v)
+            self._write("\n}")
+        else:
+            self._write(json.dumps(node, ensure_ascii=False))
+
+    def _emit_list(self, ref: _ListRef) -> None:
+        collection = str(ref.path[-1])
+        n = self.reader.count(ref.path)
+        self._write("[")
+        first = 0
+        if self.skipping:
+            first = min(n, self.resume_at - self.count)
+            self._advance(first)
+        for i, rec in enumerate(self.reader.iter_items(ref.path, first), start=first):
+            for m in self.pending:
+                if m.record:
+                    rec = m.record(collection, rec)
+            self._write(("," if i else "") + "\n" + json.dumps(rec, ensure_ascii=False))
+            self._advance(1)
+            if self.count % self.checkpoint_every == 0:
+                self._save_checkpoint()
+        self._write("]")
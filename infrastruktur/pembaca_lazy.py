@@ -0,0 +1,292 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+Path_ = Tuple[Any, ...]
+
+# string JSON utuh (supaya kurung di dalam string tidak terhitung) atau tanda struktur
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\],:]', re.DOTALL)
+_SKIP = re.compile(r"[ \t\r\n,]*")
+_WS = re.compile(rb"[ \t\r\n]*")
+_SCAN = json.JSONDecoder().scan_once
+# angka yang diikuti karakter ini terpotong jendela (mis. "0." dari "0.0015")
+_NUMBER_CONT = (".", "e", "E")
+_CHUNK = 1 << 20
+# record di-parse per kelompok: cepat, tapi memori tetap terbatas
+_ITER_BATCH = 512
+# di Windows file yang masih ter-mmap tidak bisa diganti (os.replace gagal), padahal
+# snapshot lama boleh dipegang pembaca selama commit: isi file disalin ke memori
+_USE_MMAP = os.name != "nt"
+
+class ListLayout(NamedTuple):
+    """Offset, digest, dan indeks list dari satu versi file (tanpa mmap-nya)."""
+    items: Dict[Path_, Tuple[array, array]]
+    digests: Dict[Path_, bytes]
+    field_index: Dict[Tuple[Path_, str], Tuple[Dict[Any, int], int]]
+
+class LazyJsonReader:
+    """Pembaca db.json berbasis mmap yang hanya mem-parse bagian yang diminta.
+
+    Saat dibuka, file dipindai sekali untuk mencatat offset byte setiap
+    nilai di luar list (koleksi, kompetisi, kuota, ...) dan offset setiap
+    elemen list (record). Isi record tidak di-parse kecuali diminta.
+    mmap tetap menunjuk ke file yang dibuka, jadi pembaca ini melihat satu
+    versi dokumen walaupun file sudah diganti oleh write berikutnya. Di
+    Windows isi file dibaca ke memori sebagai ganti mmap (lihat _USE_MMAP),
+    sehingga pembaca tidak menahan file yang akan diganti.
+
+    Bila `layout` dari versi sebelumnya diberikan, list yang isinya
+    tidak berubah, atau hanya bertambah di belakang, tidak dipindai ulang:
+    offset dan indeks pencariannya diambil dari versi lama setelah digest
+    byte-nya dicocokkan.
+    """
+
+    def __init__(self, path: Path, layout: Optional[ListLayout] = None):
+        self.path = path
+        with path.open("rb") as f:
+            st = os.fstat(f.fileno())
+            # identitas versi file yang ter-mmap (inode, ukuran, mtime)
+            self.identity = (st.st_ino, st.st_size, st.st_mtime_ns)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if _USE_MMAP else f.read()
+        self._spans: Dict[Path_, Tuple[int, int]] = {}
+        self._items: Dict[Path_, Tuple[array, array]] = {}
+        self._keys: Dict[Path_, List[str]] = {}
+        # (indeks nilai -> posisi, jumlah record yang sudah terindeks)
+        self._field_index: Dict[Tuple[Path_, str], Tuple[Dict[Any, int], int]] = {}
+        self._digests: Dict[Path_, bytes] = {}
+        self._previous = layout
+        try:
+            self._index()
+        finally:
+            self._previous = None
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+
+    def list_layout(self) -> ListLayout:
+        return ListLayout(self._items, self._digests, self._field_index)
+
+    def has(self, path: Path_) -> bool:
+        return path in self._spans or self._item_span(path) is not None
+
+    def get(self, path: Path_, default: Any = None) -> Any:
+        if not path:
+            return json.loads(self._mm[:])
+        span = self._spans.get(path) or self._item_span(path)
+        if span is None:
+            return default
+        return json.loads(self._mm[span[0]:span[1]])
+
+    def keys(self, path: Path_) -> Optional[List[str]]:
+        """Urutan key objek di `path` (None bila bukan objek di luar list)."""
+        return self._keys.get(path)
+
+    def is_list(self, path: Path_) -> bool:
+        return path in self._items
+
+    def count(self, path: Path_) -> int:
+        items = self._items.get(path)
+        return len(items[0]) if items else 0
+
+    def item_range(self, path: Path_, start: int, end: int) -> Tuple[int, int]:
+        """Offset byte dari elemen ke-`start` sampai sebelum ke-`end`."""
+        starts, ends = self._items[path]
+        return starts[start], ends[end - 1]
+
+    def iter_items(self, path: Path_, start: int = 0) -> Iterator[Any]:
+        items = self._items.get(path)
+        if not items:
+            return
+        starts, ends = items
+        mm = self._mm
+        for i in range(start, len(starts), _ITER_BATCH):
+            j = min(len(starts), i + _ITER_BATCH) - 1
+            yield from json.loads(b"[" + mm[starts[i]:ends[j]] + b"]")
+
+    def find(self, path: Path_, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Cari record di list `path` dengan record[field] == value.
+
+        Pencarian pertama untuk (path, field) membangun indeks nilai ->
+        posisi record dari byte mentah (tanpa mem-parse record); setelah
+        itu satu lookup hanya mem-parse satu record.
+        """
+        items = self._items.get(path)
+        if not items or not len(items[0]):
+            return None
+        starts, ends = items
+        entry = self._field_index.get((path, field))
+        if entry is None or entry[1] < len(starts):
+            entry = self._field_index[(path, field)] = self._build_field_index(path, field, entry)
+        # indeks hanya berisi string dan int (bool juga int, tapi tertulis true/false)
+        indexed = isinstance(value, (str, int)) and not isinstance(value, bool)
+        i = entry[0].get(value) if indexed else None
+        if i is not None:
+            rec = json.loads(self._mm[starts[i]:ends[i]])
+            if rec.get(field) == value:
+                return rec
+        elif indexed:
+            return None
+        return self._scan_find(path, field, value)
+
+    def _build_field_index(self, path: Path_, field: str, base: Optional[Tuple[Dict[Any, int], int]]) -> Tuple[Dict[Any, int], int]:
+        starts, ends = self._items[path]
+        # indeks warisan bisa dipakai bersama versi lain: disalin sebelum ditambah
+        index: Dict[Any, int] = dict(base[0]) if base else {}
+        j = base[1] if base else 0
+        pattern = re.compile(
+            b'"' + re.escape(field.encode("utf-8")) + rb'"\s*:\s*("(?:[^"\\]|\\.)*"|-?\d+)(?=\s*[,}])'
+        )
+        n = len(starts)
+        if j >= n:
+            return index, n
+        for m in pattern.finditer(self._mm, starts[j], ends[-1]):
+            pos = m.start()
+            while j < n and ends[j] <= pos:
+                j += 1
+            if j < n and starts[j] <= pos:
+                index.setdefault(json.loads(m.group(1)), j)
+        return index, n
+
+    def _scan_find(self, path: Path_, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        starts, ends = self._items[path]
+        encoded = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        needle = re.compile(b'"' + re.escape(field.encode("utf-8")) + rb'"\s*:\s*' + re.escape(encoded))
+        for m in needle.finditer(self._mm, starts[0], ends[-1]):
+            i = bisect_right(starts, m.start()) - 1
+            if i < 0 or m.end() > ends[i]:
+                continue
+            rec = json.loads(self._mm[starts[i]:ends[i]])
+            if isinstance(rec, dict) and rec.get(field) == value:
+                return rec
+        return None
+
+    def _item_span(self, path: Path_) -> Optional[Tuple[int, int]]:
+        if not path or not isinstance(path[-1], int):
+            return None
+        items = self._items.get(path[:-1])
+        if not items or not 0 <= path[-1] < len(items[0]):
+            return None
+        return items[0][path[-1]], items[1][path[-1]]
+
+    def _index(self) -> None:
+        m = _TOKEN.search(self._mm)
+        if m is None or m.group() != b"{":
+            raise ValueError(f"{self.path} bukan objek JSON")
+        self._scan_object(m.end(), ())
+
+    def _scan_object(self, pos: int, path: Path_) -> int:
+        mm = self._mm
+        key = None
+        val_start = pos
+        keys = self._keys[path] = []
+        while True:
+            m = _TOKEN.search(mm, pos)
+            if m is None:
+                raise ValueError(f"{self.path}: objek tidak ditutup")
+            tok = m.group()
+            pos = m.end()
+            if tok[:1] == b'"':
+                if key is None:
+                    key = json.loads(tok)
+                    keys.append(key)
+            elif tok == b":":
+                val_start = pos
+            elif tok == b"{":
+                pos = self._scan_object(pos, path + (key,))
+            elif tok == b"[":
+                pos = self._scan_array(pos, path + (key,))
+            elif tok in (b",", b"}"):
+                if key is not None:
+                    self._spans[path + (key,)] = (val_start, m.start())
+                    key = None
+                if tok == b"}":
+                    return pos
+
+    def _scan_array(self, pos: int, path: Path_) -> int:
+        # batas tiap elemen dicari dengan scanner C milik modul json di jendela teks
+        # yang di-decode sepotong-sepotong, bukan dengan tokenizer Python
+        mm = self._mm
+        size = len(mm)
+        starts, ends = self._inherit_items(pos, path)
+        if len(starts):
+            pos = ends[-1]
+        chunk = _CHUNK
+        text, text_end = self._window(pos, chunk)
+        ci = 0
+        while True:
+            if ci >= len(text):
+                if text_end >= size:
+                    raise ValueError(f"{self.path}: list tidak ditutup")
+                text, text_end = self._window(pos, chunk)
+                ci = 0
+                continue
+            skip = _SKIP.match(text, ci).end()
+            if skip > ci:
+                pos += skip - ci
+                ci = skip
+                continue
+            if text[ci] == "]":
+                self._items[path] = (starts, ends)
+                if len(starts):
+                    self._digests[path] = self._digest(starts[0], ends[-1])
+                return pos + 1
+            try:
+                _, ce = _SCAN(text, ci)
+                if text_end < size and (ce >= len(text) or text[ce] in _NUMBER_CONT):
+                    raise ValueError("elemen terpotong jendela")
+            except (StopIteration, ValueError):
+                if text_end >= size:
+                    raise ValueError(f"{self.path}: elemen list di offset {pos} tidak valid")
+                # elemen terpotong di ujung jendela: geser jendela ke awal elemen;
+                # jendela hanya diperbesar bila satu elemen memang lebih besar
+                chunk = chunk * 2 if ci == 0 else _CHUNK
+                text, text_end = self._window(pos, chunk)
+                ci = 0
+                continue
+            nbytes = len(text[ci:ce].encode("utf-8"))
+            starts.append(pos)
+            ends.append(pos + nbytes)
+            pos += nbytes
+            ci = ce
+
+    def _inherit_items(self, pos: int, path: Path_) -> Tuple[array, array]:
+        prev = self._previous
+        digest = prev.digests.get(path) if prev is not None else None
+        if digest is None:
+            return array("q"), array("q")
+        old_starts, old_ends = prev.items[path]
+        first = _WS.match(self._mm, pos).end()
+        end = first + (old_ends[-1] - old_starts[0])
+        if end > len(self._mm) or self._digest(first, end) != digest:
+            return array("q"), array("q")
+        # elemen terakhir versi lama harus benar-benar selesai di sini (mis. 12 vs 123)
+        after = _WS.match(self._mm, end).end()
+        if after >= len(self._mm) or self._mm[after:after + 1] not in (b",", b"]"):
+            return array("q"), array("q")
+        # awal list sama persis dengan versi lama: cukup geser offset-nya
+        delta = first - old_starts[0]
+        starts = array("q", (x + delta for x in old_starts))
+        ends = array("q", (x + delta for x in old_ends))
+        for (p, field), entry in list(prev.field_index.items()):
+            if p == path:
+                self._field_index[(p, field)] = entry
+        return starts, ends
+
+    def _digest(self, start: int, end: int) -> bytes:
+        with memoryview(self._mm) as mv, mv[start:end] as part:
+            return hashlib.sha1(part).digest()
+
+    def _window(self, start: int, length: int) -> Tuple[str, int]:
+        mm = self._mm
+        end = min(len(mm), start + length)
+        # jangan memotong karakter UTF-8 multi-byte
+        while end < len(mm) and (mm[end] & 0xC0) == 0x80:
+            end -= 1
+        return mm[start:end].decode("utf-8"), end
@@ -1,29 +1,290 @@
+import copy
 import json
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
-from core.konstanta import DATA_DIR, DB_PATH
+from typing import Any, Dict, Iterator, Optional, Tuple
+from core.konstanta import DB_PATH, SCHEMA_VERSION
+from infrastruktur.pembaca_lazy import LazyJsonReader, ListLayout
 
 DEFAULT_DB: Dict[str, Any] = {
+    "__schema_version": SCHEMA_VERSION,
     "users": [],
-    "competition": None,
-    "registrations": [],
-    "schedule_slots": [],
-    "scores": []
+    "competitions": {},
+    "active_competition": None,
+    "partitions": {},
+    "events": []
 }
 
+_MISSING = object()
+
+def _walk(doc: Any, path: Tuple[Any, ...], default: Any = None) -> Any:
+    node = doc
+    for key in path:
+        if isinstance(node, dict) and key in node:
+            node = node[key]
+        elif isinstance(node, list) and isinstance(key, int) and 0 <= key < len(node):
+            node = node[key]
+        else:
+            return default
+    return node
+
+class _DocReader:
+    """Antarmuka baca LazyJsonReader di atas dokumen yang sudah ada di memori."""
+    identity = None
+
+    def __init__(self, doc: Dict[str, Any]):
+        self.doc = doc
+
+    def get(self, path: Tuple[Any, ...], default: Any = None) -> Any:
+        return _walk(self.doc, path, default)
+
+    def has(self, path: Tuple[Any, ...]) -> bool:
+        return _walk(self.doc, path, _MISSING) is not _MISSING
+
+    def count(self, path: Tuple[Any, ...]) -> int:
+        return len(_walk(self.doc, path) or [])
+
+    def iter_items(self, path: Tuple[Any, ...], start: int = 0) -> Iterator[Any]:
+        return iter((_walk(self.doc, path) or [])[start:])
+
+    def find(self, path: Tuple[Any, ...], field: str, value: Any) -> Optional[Dict[str, Any]]:
+        return next((r for r in _walk(self.doc, path) or [] if r.get(field) == value), None)
+
+class Snapshot:
+    """Tampilan read-only dokumen pada satu versi.
+
+    Punya API baca yang sama dengan JsonStore, jadi repo bisa di-pin ke
+    snapshot (BaseRepo.pinned). Semua pembacaan lewat snapshot yang sama
+    melihat versi yang sama walaupun ada commit baru di tengah jalan, dan
+    satu snapshot dipakai bersama oleh semua thread pembaca sampai commit
+    berikutnya.
+    """
+
+    def __init__(self, store: "JsonStore", reader: Any):
+        self.store = store
+        self.reader = reader
+        self.version = reader.identity
+
+    def read_path(self, path: Tuple[Any, ...], default: Any = None) -> Any:
+        return self.reader.get(path, default)
+
+    def has_path(self, path: Tuple[Any, ...]) -> bool:
+        return self.reader.has(path)
+
+    def count_path(self, path: Tuple[Any, ...]) -> int:
+        return self.reader.count(path)
+
+    def iter_path(self, path: Tuple[Any, ...], start: int = 0) -> Iterator[Any]:
+        return self.reader.iter_items(path, start)
+
+    def find_in(self, path: Tuple[Any, ...], field: str, value: Any) -> Optional[Dict[str, Any]]:
+        return self.reader.find(path, field, value)
+
+    def read_archive(self, competition_id: str) -> Dict[str, Any]:
+        return self.store.read_archive(competition_id)
+
+    def snapshot(self) -> "Snapshot":
+        return self
+
+    def read(self) -> Dict[str, Any]:
+        raise RuntimeError("snapshot hanya bisa dibaca")
+
+    def write(self, data: Dict[str, Any]) -> None:
+        raise RuntimeError("snapshot hanya bisa dibaca")
+
 class JsonStore:
     def __init__(self, path: Path = DB_PATH):
         self.path = path
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        if not self.path.exists():
-            self.write(DEFAULT_DB)
+        self._local = threading.local()
+        self._session_lock = threading.RLock()
+        self.archive_dir = self.path.parent / "arsip"
+        self._archives: Dict[str, Dict[str, Any]] = {}
+        self._snapshot: Optional[Snapshot] = None
+        self._snapshot_key: Optional[Tuple[int, int, int]] = None
+        self._layout: Optional[ListLayout] = None
+        self._building: Dict[Tuple[int, int, int], threading.Event] = {}
+        self._reader_lock = threading.Lock()
 
     def read(self) -> Dict[str, Any]:
-        with self.path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        if getattr(self._local, "active", False):
+            # dokumen sesi baru di-load saat pertama kali dibutuhkan utuh
+            if self._local.db is None:
+                self._local.db = self._load()
+            return self._local.db
+        return self._load()
 
     def write(self, data: Dict[str, Any]) -> None:
+        if getattr(self._local, "active", False):
+            self._local.db = data
+            self._local.dirty = True
+            return
+        self._dump(data)
+
+    @contextmanager
+    def session(self) -> Iterator["JsonStore"]:
+        """Simpan dokumen di memori; write() ditahan sampai commit().
+
+        Sesi milik thread yang membukanya: thread lain tetap membaca
+        versi terakhir yang sudah di-commit, dan hanya satu sesi yang
+        aktif pada satu waktu.
+        """
+        if getattr(self._local, "active", False):
+            yield self
+            return
+        with self._session_lock:
+            self._local.active = True
+            self._local.db = None
+            self._local.dirty = False
+            try:
+                yield self
+                self.commit()
+            finally:
+                self._local.active = False
+                self._local.db = None
+                self._local.dirty = False
+
+    def commit(self) -> bool:
+        session = getattr(self._local, "db", None)
+        if session is not None and self._local.dirty:
+            self._dump(session)
+            self._local.dirty = False
+            return True
+        return False
+
+    # --- baca parsial: hanya bagian dokumen yang diminta yang di-parse ---
+
+    def read_path(self, path: Tuple[Any, ...], default: Any = None) -> Any:
+        return self.snapshot().read_path(path, default)
+
+    def has_path(self, path: Tuple[Any, ...]) -> bool:
+        return self.snapshot().has_path(path)
+
+    def count_path(self, path: Tuple[Any, ...]) -> int:
+        return self.snapshot().count_path(path)
+
+    def iter_path(self, path: Tuple[Any, ...], start: int = 0) -> Iterator[Any]:
+        return self.snapshot().iter_path(path, start)
+
+    def find_in(self, path: Tuple[Any, ...], field: str, value: Any) -> Optional[Dict[str, Any]]:
+        return self.snapshot().find_in(path, field, value)
+
+    def snapshot(self) -> Snapshot:
+        """Versi dokumen saat ini sebagai tampilan read-only.
+
+        Di luar sesi, snapshot menunjuk ke versi file yang sudah di-commit
+        dan tidak terpengaruh commit berikutnya. Di dalam sesi yang sudah
+        memuat dokumen, snapshot membaca dokumen sesi itu sendiri (tidak
+        ada penulis lain selama sesi berjalan).
+        """
+        session = getattr(self._local, "db", None)
+        if session is not None:
+            return Snapshot(self, _DocReader(session))
+        if not self.path.exists():
+            return Snapshot(self, _DocReader(copy.deepcopy(DEFAULT_DB)))
+        return self._committed()
+
+    def reader(self) -> Optional[LazyJsonReader]:
+        """Pembaca lazy untuk versi file yang sudah di-commit (None bila belum ada file)."""
+        if not self.path.exists():
+            return None
+        return self._committed().reader
+
+    def release(self) -> None:
+        """Tutup pembaca versi ter-commit, mis. sebelum file diganti di luar store.
+
+        Hanya untuk saat tidak ada snapshot yang sedang dipegang (startup):
+        mmap-nya ikut ditutup.
+        """
+        with self._reader_lock:
+            snap = self._snapshot
+            self._snapshot = self._snapshot_key = self._layout = None
+        if snap is not None:
+            snap.reader.close()
+
+    def _file_key(self) -> Tuple[int, int, int]:
+        st = os.stat(self.path)
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _committed(self) -> Snapshot:
+        key = self._file_key()
+        with self._reader_lock:
+            if self._snapshot is not None and self._snapshot_key == key:
+                return self._snapshot
+            building = self._building.get(key)
+            if building is None:
+                building = self._building[key] = threading.Event()
+                # list yang tidak berubah sejak versi sebelumnya tidak dipindai ulang
+                layout = self._layout or (self._snapshot.reader.list_layout() if self._snapshot else None)
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            # versi ini sedang diindeks thread lain: tunggu hasilnya
+            building.wait()
+            with self._reader_lock:
+                if self._snapshot is not None and self._snapshot_key == key:
+                    return self._snapshot
+            return self._committed()
+
+        # indeks dibangun di luar lock, jadi commit (_dump) tidak ikut menunggu
+        try:
+            snap = Snapshot(self, LazyJsonReader(self.path, layout))
+            with self._reader_lock:
+                # hanya dipasang bila file belum diganti lagi selama pengindeksan
+                if snap.version == self._file_key():
+                    self._snapshot = snap
+                    self._snapshot_key = snap.version
+                    self._layout = None
+        finally:
+            with self._reader_lock:
+                self._building.pop(key, None)
+            building.set()
+        return snap
+
+    def write_archive(self, competition_id: str, data: Dict[str, Any]) -> None:
+        import gzip
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self._archive_path(competition_id)
+        tmp = path.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        tmp.replace(path)
+        self._archives.pop(competition_id, None)
+
+    def read_archive(self, competition_id: str) -> Dict[str, Any]:
+        """Arsip dibaca saat pertama kali diminta, lalu di-cache (read-only)."""
+        cached = self._archives.get(competition_id)
+        if cached is None:
+            import gzip
+            with gzip.open(self._archive_path(competition_id), "rt", encoding="utf-8") as f:
+                cached = self._archives[competition_id] = json.load(f)
+        return cached
+
+    def _archive_path(self, competition_id: str) -> Path:
+        return self.archive_dir / f"{competition_id}.json.gz"
+
+    def _load(self) -> Dict[str, Any]:
+        # file belum ada: anggap dokumen kosong, baru dibuat saat write pertama
+        try:
+            f = self.path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return copy.deepcopy(DEFAULT_DB)
+        with f:
+            return json.load(f)
+
+    def _dump(self, data: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
         tmp = self.path.with_suffix(".tmp")
         with tmp.open("w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
-        tmp.replace(self.path)
\ No newline at end of file
+        with self._reader_lock:
+            # snapshot lama tidak ditutup: pembaca yang masih memegangnya tetap melihat
+            # versi lama (POSIX: mmap tetap valid setelah replace; di Windows pembaca
+            # tidak memakai mmap, lihat pembaca_lazy._USE_MMAP). Yang disimpan store
+            # hanya tata letak list-nya untuk versi berikutnya
+            if self._snapshot is not None:
+                self._layout = self._snapshot.reader.list_layout()
+            self._snapshot = None
+        tmp.replace(self.path)
@@ -1,13 +1,15 @@
 from __future__ import annotations
+import copy
+import time
 from dataclasses import asdict
-from typing import Any, Dict, List, Optional
-from core.kesalahan import NotFoundError
-from domain.enumerasi import Role, RegistrationStatus, PaymentMethod
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from core.kesalahan import ConflictError, NotFoundError, ValidationError
+from domain.enumerasi import Role, RegistrationStatus, PaymentMethod, EventType
 from domain.model import (
     User, Participant, ParticipantProfile, Competition, Category,
-    Registration, Payment, ScheduleSlot, Score
+    Registration, Payment, ScheduleSlot, Score, Event, now_iso
 )
-from infrastruktur.penyimpanan_json import JsonStore
+from infrastruktur.penyimpanan_json import JsonStore, Snapshot
 
 def _require(obj, msg: str):
     if obj is None:
@@ -24,9 +26,80 @@ class IdGenerator:
         db[counter_key] = n
         return f"{self.prefix}_{n:04d}"
 
+def _empty_partition() -> Dict[str, Any]:
+    return {"registrations": [], "schedule_slots": [], "scores": [], "quota": {}}
+
+def _append_events(db: Dict[str, Any], entity_id: str, events: List[Tuple[EventType, Dict[str, Any]]], competition_id: Optional[str] = None) -> None:
+    # event ditulis di dokumen yang sama dengan perubahan state-nya,
+    # jadi keduanya tersimpan (atau gagal) bersamaan
+    log = db["events"]
+    for event_type, payload in events:
+        seq = int(db.get("__counter_event", 0)) + 1
+        db["__counter_event"] = seq
+        log.append({
+            "seq": seq, "type": event_type.value, "entity_id": entity_id,
+            "payload": payload, "at": now_iso(), "competition_id": competition_id
+        })
+
 class BaseRepo:
-    def __init__(self, store: JsonStore):
+    def __init__(self, store: JsonStore, competition_id: Optional[str] = None):
         self.store = store
+        self.competition_id = competition_id
+
+    def pinned(self, snapshot: Snapshot) -> "BaseRepo":
+        """Salinan repo ini yang hanya membaca dari satu snapshot."""
+        repo = copy.copy(self)
+        repo.store = snapshot
+        return repo
+
+    def _competition_id(self, db: Dict[str, Any]) -> str:
+        return _require(self.competition_id or db.get("active_competition"), "belum ada kompetisi aktif")
+
+    def _partition(self, db: Dict[str, Any], for_write: bool = False) -> Dict[str, Any]:
+        """Data milik satu kompetisi saja (pendaftaran, jadwal, nilai, kuota)."""
+        cid = self._competition_id(db)
+        part = db["partitions"].get(cid)
+        if part is not None:
+            return part
+        comp = _require(db["competitions"].get(cid), "kompetisi tidak ditemukan")
+        if comp["archived"]:
+            if for_write:
+                raise ValidationError("kompetisi sudah diarsipkan (read-only)")
+            return self.store.read_archive(cid)["partition"]
+        part = db["partitions"][cid] = _empty_partition()
+        return part
+
+    # jalur baca: lewat read_path/iter_path/find_in supaya store hanya
+    # mem-parse bagian partisi yang dibutuhkan, bukan seluruh dokumen;
+    # semua langkah satu pembacaan memakai snapshot yang sama
+
+    def _active_id(self, view: Snapshot) -> str:
+        return _require(self.competition_id or view.read_path(("active_competition",)), "belum ada kompetisi aktif")
+
+    def _archived_partition(self, cid: str, view: Snapshot) -> Optional[Dict[str, Any]]:
+        """Partisi dari file arsip; None bila partisinya masih ada di db."""
+        if view.has_path(("partitions", cid)):
+            return None
+        comp = _require(view.read_path(("competitions", cid)), "kompetisi tidak ditemukan")
+        if comp["archived"]:
+            return view.read_archive(cid)["partition"]
+        return _empty_partition()
+
+    def _records(self, name: str) -> Iterator[Dict[str, Any]]:
+        view = self.store.snapshot()
+        cid = self._active_id(view)
+        archived = self._archived_partition(cid, view)
+        if archived is not None:
+            return iter(archived[name])
+        return view.iter_path(("partitions", cid, name))
+
+    def _find(self, name: str, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        view = self.store.snapshot()
+        cid = self._active_id(view)
+        archived = self._archived_partition(cid, view)
+        if archived is not None:
+            return next((r for r in archived[name] if r.get(field) == value), None)
+        return view.find_in(("partitions", cid, name), field, value)
 
 class UserRepo(BaseRepo):
     def __init__(self, store: JsonStore):
@@ -34,18 +107,12 @@ class UserRepo(BaseRepo):
         self.ids = IdGenerator("user")
 
     def find_by_username(self, username: str) -> Optional[User]:
-        db = self.store.read()
-        for u in db["users"]:
-            if u["username"] == username:
-                return self._from_dict(u)
-        return None
+        u = self.store.find_in(("users",), "username", username)
+        return self._from_dict(u) if u else None
 
     def get(self, user_id: str) -> User:
-        db = self.store.read()
-        for u in db["users"]:
-            if u["id"] == user_id:
-                return self._from_dict(u)
-        raise NotFoundError("user tidak ditemukan")
+        u = _require(self.store.find_in(("users",), "id", user_id), "user tidak ditemukan")
+        return self._from_dict(u)
 
     def add(self, user: User) -> None:
         db = self.store.read()
@@ -66,26 +133,66 @@ class UserRepo(BaseRepo):
     def _from_dict(self, d: Dict[str, Any]) -> User:
         role = Role(d["role"])
         if role == Role.PARTICIPANT:
-            prof = d.get("profile") or {}
-            profile = ParticipantProfile(
-                full_name=prof.get("full_name", ""),
-                age=int(prof.get("age", 0)),
-                phone=prof.get("phone", "")
-            )
-            return Participant(**{**d, "role": role, "profile": profile})
+            return Participant(**{**d, "role": role, "profile": ParticipantProfile(**d["profile"])})
         return User(**{**d, "role": role})
 
 class CompetitionRepo(BaseRepo):
+    def __init__(self, store: JsonStore, competition_id: Optional[str] = None):
+        super().__init__(store, competition_id)
+        self.ids = IdGenerator("comp")
+
+    def next_id(self) -> str:
+        db = self.store.read()
+        new_id = self.ids.new_id(db)
+        while new_id in db["competitions"]:
+            new_id = self.ids.new_id(db)
+        self.store.write(db)
+        return new_id
+
     def set_competition(self, comp: Competition) -> None:
         db = self.store.read()
-        db["competition"] = self._to_dict(comp)
+        # id yang sudah ada (termasuk yang diarsipkan) tidak boleh ditimpa
+        if comp.id in db["competitions"]:
+            raise ConflictError(f"kompetisi {comp.id} sudah ada")
+        db["competitions"][comp.id] = self._to_dict(comp)
+        if not comp.archived:
+            db["partitions"].setdefault(comp.id, _empty_partition())
+        if db.get("active_competition") is None:
+            db["active_competition"] = comp.id
         self.store.write(db)
 
     def get_competition(self) -> Competition:
-        db = self.store.read()
-        raw = _require(db.get("competition"), "competition belum di-seed")
+        cid = _require(self.competition_id or self.active_id(), "competition belum di-seed")
+        raw = _require(self.store.read_path(("competitions", cid)), "kompetisi tidak ditemukan")
         return self._from_dict(raw)
 
+    def list_competitions(self) -> List[Competition]:
+        return [self._from_dict(c) for c in self.store.read_path(("competitions",), {}).values()]
+
+    def active_id(self) -> Optional[str]:
+        return self.store.read_path(("active_competition",))
+
+    def set_active(self, comp_id: str) -> None:
+        db = self.store.read()
+        comp = _require(db["competitions"].get(comp_id), "kompetisi tidak ditemukan")
+        if comp["archived"]:
+            raise ValidationError("kompetisi yang sudah diarsipkan tidak bisa diaktifkan")
+        db["active_competition"] = comp_id
+        self.store.write(db)
+
+    def archive(self, comp_id: str) -> None:
+        """Pindahkan partisi kompetisi ke file arsip read-only."""
+        db = self.store.read()
+        comp = _require(db["competitions"].get(comp_id), "kompetisi tidak ditemukan")
+        if comp["archived"]:
+            raise ValidationError("kompetisi sudah diarsipkan")
+        part = db["partitions"].pop(comp_id, None) or _empty_partition()
+        self.store.write_archive(comp_id, {"competition": comp, "partition": part})
+        comp["archived"] = True
+        if db.get("active_competition") == comp_id:
+            db["active_competition"] = None
+        self.store.write(db)
+
     def _to_dict(self, comp: Competition) -> Dict[str, Any]:
         return {
             "id": comp.id,
@@ -95,19 +202,21 @@ class CompetitionRepo(BaseRepo):
             "deadline": comp.deadline,
             "categories": {
                 cid: asdict(cat) for cid, cat in comp.categories.items()
-            }
+            },
+            "archived": comp.archived
         }
 
     def _from_dict(self, d: Dict[str, Any]) -> Competition:
         cats = {cid: Category(**c) for cid, c in d["categories"].items()}
         return Competition(
             id=d["id"], name=d["name"], location=d["location"],
-            date=d["date"], deadline=d["deadline"], categories=cats
+            date=d["date"], deadline=d["deadline"], categories=cats,
+            archived=d["archived"]
         )
 
 class RegistrationRepo(BaseRepo):
-    def __init__(self, store: JsonStore):
-        super().__init__(store)
+    def __init__(self, store: JsonStore, competition_id: Optional[str] = None):
+        super().__init__(store, competition_id)
         self.ids = IdGenerator("reg")
 
     def next_id(self) -> str:
@@ -118,36 +227,52 @@ class RegistrationRepo(BaseRepo):
 
     def add(self, reg: Registration) -> None:
         db = self.store.read()
-        db["registrations"].append(self._to_dict(reg))
+        part = self._partition(db, for_write=True)
+        part["registrations"].append(self._to_dict(reg))
+        if reg.status != RegistrationStatus.REJECTED:
+            self._bump_quota(part, reg.category_id, 1)
+        created = (EventType.REGISTRATION_CREATED, {
+            "status": reg.status.value, "participant_id": reg.participant_id, "category_id": reg.category_id
+        })
+        _append_events(db, reg.id, [created] + reg.pull_events(), self._competition_id(db))
         self.store.write(db)
 
     def update(self, reg: Registration) -> None:
         db = self.store.read()
-        for i, r in enumerate(db["registrations"]):
+        part = self._partition(db, for_write=True)
+        for i, r in enumerate(part["registrations"]):
             if r["id"] == reg.id:
-                db["registrations"][i] = self._to_dict(reg)
+                was_rejected = r["status"] == RegistrationStatus.REJECTED.value
+                is_rejected = reg.status == RegistrationStatus.REJECTED
+                if was_rejected != is_rejected:
+                    self._bump_quota(part, reg.category_id, 1 if was_rejected else -1)
+                part["registrations"][i] = self._to_dict(reg)
+                _append_events(db, reg.id, reg.pull_events(), self._competition_id(db))
                 self.store.write(db)
                 return
         raise NotFoundError("registration tidak ditemukan")
 
     def get(self, reg_id: str) -> Registration:
-        db = self.store.read()
-        for r in db["registrations"]:
-            if r["id"] == reg_id:
-                return self._from_dict(r)
-        raise NotFoundError("registration tidak ditemukan")
+        r = _require(self._find("registrations", "id", reg_id), "registration tidak ditemukan")
+        return self._from_dict(r)
 
     def list_by_participant(self, participant_id: str) -> List[Registration]:
-        db = self.store.read()
-        return [self._from_dict(r) for r in db["registrations"] if r["participant_id"] == participant_id]
+        return [self._from_dict(r) for r in self._records("registrations") if r["participant_id"] == participant_id]
 
     def list_by_status(self, status: RegistrationStatus) -> List[Registration]:
-        db = self.store.read()
-        return [self._from_dict(r) for r in db["registrations"] if r["status"] == status.value]
+        return [self._from_dict(r) for r in self._records("registrations") if r["status"] == status.value]
 
     def count_in_category(self, category_id: str) -> int:
-        db = self.store.read()
-        return sum(1 for r in db["registrations"] if r["category_id"] == category_id and r["status"] != RegistrationStatus.REJECTED.value)
+        view = self.store.snapshot()
+        cid = self._active_id(view)
+        archived = self._archived_partition(cid, view)
+        if archived is not None:
+            return int(archived["quota"].get(category_id, 0))
+        return int(view.read_path(("partitions", cid, "quota", category_id), 0))
+
+    def _bump_quota(self, part: Dict[str, Any], category_id: str, delta: int) -> None:
+        quota = part["quota"]
+        quota[category_id] = int(quota.get(category_id, 0)) + delta
 
     def _to_dict(self, reg: Registration) -> Dict[str, Any]:
         d = asdict(reg)
@@ -157,33 +282,14 @@ class RegistrationRepo(BaseRepo):
         return d
 
     def _from_dict(self, d: Dict[str, Any]) -> Registration:
-        payment = None
-        if d.get("payment"):
-            p = d["payment"]
-            payment = Payment(
-                method=PaymentMethod(p["method"]),
-                amount=int(p["amount"]),
-                proof=p["proof"],
-                paid_at=p.get("paid_at", "")
-            )
-        return Registration(
-            id=d["id"],
-            participant_id=d["participant_id"],
-            category_id=d["category_id"],
-            song_title=d["song_title"],
-            song_creator=d["song_creator"],
-            media_link=d["media_link"],
-            status=RegistrationStatus(d["status"]),
-            submitted_at=d.get("submitted_at"),
-            payment=payment,
-            verified_at=d.get("verified_at"),
-            rejected_reason=d.get("rejected_reason"),
-            schedule_slot_id=d.get("schedule_slot_id"),
-        )
+        # skema v2 menjamin semua field ada (lihat infrastruktur/migrasi.py)
+        p = d["payment"]
+        payment = Payment(**{**p, "method": PaymentMethod(p["method"])}) if p else None
+        return Registration(**{**d, "status": RegistrationStatus(d["status"]), "payment": payment})
 
 class ScheduleRepo(BaseRepo):
-    def __init__(self, store: JsonStore):
-        super().__init__(store)
+    def __init__(self, store: JsonStore, competition_id: Optional[str] = None):
+        super().__init__(store, competition_id)
         self.ids = IdGenerator("slot")
 
     def next_id(self) -> str:
@@ -194,23 +300,19 @@ class ScheduleRepo(BaseRepo):
 
     def add(self, slot: ScheduleSlot) -> None:
         db = self.store.read()
-        db["schedule_slots"].append(asdict(slot))
+        self._partition(db, for_write=True)["schedule_slots"].append(asdict(slot))
         self.store.write(db)
 
     def list_all(self) -> List[ScheduleSlot]:
-        db = self.store.read()
-        return [ScheduleSlot(**s) for s in db["schedule_slots"]]
+        return [ScheduleSlot(**s) for s in self._records("schedule_slots")]
 
     def get_by_registration(self, reg_id: str) -> Optional[ScheduleSlot]:
-        db = self.store.read()
-        for s in db["schedule_slots"]:
-            if s["registration_id"] == reg_id:
-                return ScheduleSlot(**s)
-        return None
+        s = self._find("schedule_slots", "registration_id", reg_id)
+        return ScheduleSlot(**s) if s else None
 
 class ScoreRepo(BaseRepo):
-    def __init__(self, store: JsonStore):
-        super().__init__(store)
+    def __init__(self, store: JsonStore, competition_id: Optional[str] = None):
+        super().__init__(store, competition_id)
         self.ids = IdGenerator("score")
 
     def next_id(self) -> str:
@@ -221,14 +323,50 @@ class ScoreRepo(BaseRepo):
 
     def upsert(self, score: Score) -> None:
         db = self.store.read()
-        for i, s in enumerate(db["scores"]):
+        scores = self._partition(db, for_write=True)["scores"]
+        cid = self._competition_id(db)
+        d = asdict(score)
+        event = [(EventType.SCORE_UPSERTED, {k: v for k, v in d.items() if k != "id"})]
+        for i, s in enumerate(scores):
             if s["registration_id"] == score.registration_id and s["judge_id"] == score.judge_id:
-                db["scores"][i] = asdict(score)
+                scores[i] = d
+                _append_events(db, score.id, event, cid)
                 self.store.write(db)
                 return
-        db["scores"].append(asdict(score))
+        scores.append(d)
+        _append_events(db, score.id, event, cid)
         self.store.write(db)
 
     def list_all(self) -> List[Score]:
-        db = self.store.read()
-        return [Score(**s) for s in db["scores"]]
\ No newline at end of file
+        return [Score(**s) for s in self._records("scores")]
+
+class EventRepo(BaseRepo):
+    def since(self, seq: int = 0, limit: Optional[int] = None) -> List[Event]:
+        # binary search per elemen: hanya O(log n) event yang di-parse untuk mencari awal
+        view = self.store.snapshot()
+        lo, hi = 0, view.count_path(("events",))
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if view.read_path(("events", mid))["seq"] <= seq:
+                lo = mid + 1
+            else:
+                hi = mid
+        out: List[Event] = []
+        for e in view.iter_path(("events",), lo):
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(self._from_dict(e))
+        return out
+
+    def tail(self, seq: int = 0, poll_interval: float = 0.5) -> Iterator[Event]:
+        """Generator tanpa akhir: keluarkan event setelah `seq`, lalu tunggu yang baru."""
+        while True:
+            batch = self.since(seq)
+            for e in batch:
+                seq = e.seq
+                yield e
+            if not batch:
+                time.sleep(poll_interval)
+
+    def _from_dict(self, d: Dict[str, Any]) -> Event:
+        return Event(seq=d["seq"], type=EventType(d["type"]), entity_id=d["entity_id"], payload=d["payload"], at=d["at"], competition_id=d["competition_id"])
\ No newline at end of file
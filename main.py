@@ -1,4 +1,8 @@
-from app.baris_perintah import run_app
+import sys
 
 if __name__ == "__main__":
-    run_app()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        from app.perintah_batch import main
+        sys.exit(main(sys.argv[1:]))
+    from app.baris_perintah import run_app
+    run_app()
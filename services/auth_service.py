@@ -1,3 +1,4 @@
+from typing import Optional
 from core.kesalahan import AuthError, ConflictError, ValidationError
 from core.keamanan import hash_password, verify_password, PasswordHash
 from domain.enumerasi import Role
@@ -8,13 +9,14 @@ class AuthService:
     def __init__(self, users: UserRepo):
         self.users = users
 
-    def register_participant(self, username: str, password: str, full_name: str, age: int, phone: str) -> Participant:
+    def register_participant(self, username: str, password: str, full_name: str, age: int, phone: str, password_hash: Optional[PasswordHash] = None) -> Participant:
         if not username or not password:
             raise ValidationError("username/password wajib diisi")
         if self.users.find_by_username(username):
             raise ConflictError("username sudah dipakai")
 
-        ph = hash_password(password)
+        # hash boleh dihitung lebih dulu di luar thread penulis (lihat app/layanan_async.py)
+        ph = password_hash or hash_password(password)
         user_id = self.users.next_id()
         participant = Participant(
             id=user_id,
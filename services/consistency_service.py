@@ -0,0 +1,329 @@
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from core.kesalahan import ConflictError
+from domain.enumerasi import EventType, RegistrationStatus
+from infrastruktur.penyimpanan_json import JsonStore
+from infrastruktur.repositori import IdGenerator, _append_events
+
+CHUNK_SIZE = 20000
+
+# field yang diambil worker dari tiap record; pemeriksaan relasi hanya butuh ini
+_FIELDS = {
+    "users": ("id", "username"),
+    "registrations": ("id", "participant_id", "category_id", "status", "schedule_slot_id"),
+    "schedule_slots": ("id", "registration_id"),
+    "scores": ("id", "registration_id", "judge_id"),
+}
+_PREFIX = {"users": "user", "registrations": "reg", "schedule_slots": "slot", "scores": "score"}
+
+@dataclass
+class Violation:
+    code: str
+    collection: str
+    id: Optional[str]
+    message: str
+    competition_id: Optional[str] = None
+    index: Optional[int] = None
+    fixable: bool = False
+    fixed: bool = False
+
+def _extract(path: str, identity: Tuple[int, int, int], collection: str, first: int, span: Tuple[int, int]) -> List[Tuple]:
+    """Worker: parse satu potongan list langsung dari offset byte-nya."""
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if (st.st_ino, st.st_size, st.st_mtime_ns) != tuple(identity):
+            raise ConflictError("db berubah selama pemeriksaan")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            records = json.loads(b"[" + mm[span[0]:span[1]] + b"]")
+    fields = _FIELDS[collection]
+    return [(first + i,) + tuple(r.get(k) for k in fields) for i, r in enumerate(records)]
+
+class ConsistencyService:
+    """Validasi relasi pendaftaran / jadwal / nilai / kuota di seluruh db.
+
+    Parsing record (bagian mahal) dibagi per potongan CHUNK_SIZE ke
+    process pool; tiap worker hanya mengembalikan field relasi yang
+    dibutuhkan, lalu semua aturan dicek di proses utama.
+    """
+
+    def __init__(self, store: JsonStore, workers: Optional[int] = None):
+        self.store = store
+        self.workers = workers
+
+    def check(self) -> List[Violation]:
+        reader = self.store.reader()
+        if reader is None:
+            return []
+        rows = self._extract_all(reader)
+        out: List[Violation] = []
+        users = rows.pop(("users",))
+        out += self._check_users(users)
+        user_ids = {u[1] for u in users}
+        all_ids: Dict[str, Dict[str, Tuple[str, int]]] = {name: {} for name in _FIELDS if name != "users"}
+
+        for cid in reader.keys(("partitions",)) or []:
+            comp = reader.get(("competitions", cid)) or {}
+            quota = reader.get(("partitions", cid, "quota"), {})
+            part = {name: rows.pop(("partitions", cid, name), []) for name in ("registrations", "schedule_slots", "scores")}
+            out += self._check_partition(cid, comp, quota, part, user_ids)
+            # id dibuat dari counter global, jadi harus unik lintas kompetisi juga
+            for name, recs in part.items():
+                local: set = set()
+                for r in recs:
+                    if r[1] in local:
+                        # salinan berikutnya sudah dilaporkan oleh _check_partition
+                        continue
+                    local.add(r[1])
+                    prev = all_ids[name].get(r[1])
+                    if prev is not None and prev[0] != cid:
+                        out.append(Violation(
+                            "duplicate_id", name, r[1], f"id juga dipakai di kompetisi {prev[0]}",
+                            competition_id=cid, index=r[0], fixable=True
+                        ))
+                    all_ids[name].setdefault(r[1], (cid, r[0]))
+        return out
+
+    def repair(self) -> List[Violation]:
+        """Cek lalu terapkan semua perbaikan otomatis dalam satu commit."""
+        identity = self._identity()
+        violations = self.check()
+        fixable = [v for v in violations if v.fixable]
+        if not fixable:
+            return violations
+        with self.store.session():
+            if self._identity() != identity:
+                raise ConflictError("db berubah selama pemeriksaan, ulangi repair")
+            db = self.store.read()
+            regs: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for cid, part in db["partitions"].items():
+                for r in part["registrations"]:
+                    regs.setdefault((cid, r["id"]), r)
+            for v in fixable:
+                v.fixed = self._apply_fix(db, regs, v)
+            self._drop_marked(db)
+            self.store.write(db)
+        return violations
+
+    def _identity(self) -> Optional[Tuple[int, int, int]]:
+        reader = self.store.reader()
+        return reader.identity if reader else None
+
+    def _extract_all(self, reader) -> Dict[Tuple, List[Tuple]]:
+        lists = [("users",)]
+        for cid in reader.keys(("partitions",)) or []:
+            lists += [("partitions", cid, name) for name in ("registrations", "schedule_slots", "scores")]
+
+        tasks = []
+        for path in lists:
+            n = reader.count(path)
+            for first in range(0, n, CHUNK_SIZE):
+                last = min(n, first + CHUNK_SIZE)
+                tasks.append((path, first, reader.item_range(path, first, last)))
+
+        rows: Dict[Tuple, List[Tuple]] = {path: [] for path in lists}
+        args = [(str(self.store.path), reader.identity, path[-1], first, span) for path, first, span in tasks]
+        if len(tasks) <= 1 or self.workers == 1:
+            results = [_extract(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_extract, *zip(*args)))
+        for (path, _, _), chunk in zip(tasks, results):
+            rows[path].extend(chunk)
+        return rows
+
+    def _check_users(self, users: List[Tuple]) -> List[Violation]:
+        out: List[Violation] = []
+        seen_ids, seen_names = set(), set()
+        for idx, uid, username in users:
+            if uid in seen_ids:
+                # tidak diperbaiki otomatis: participant_id pendaftaran tidak bisa dibedakan
+                out.append(Violation("duplicate_id", "users", uid, "id user dipakai lebih dari sekali", index=idx))
+            if username in seen_names:
+                out.append(Violation("duplicate_username", "users", uid, f"username '{username}' dipakai lebih dari sekali", index=idx))
+            seen_ids.add(uid)
+            seen_names.add(username)
+        return out
+
+    def _check_partition(self, cid: str, comp: Dict[str, Any], quota: Dict[str, int], part: Dict[str, List[Tuple]], user_ids: set) -> List[Violation]:
+        out: List[Violation] = []
+
+        def add(code, collection, rid, msg, idx=None, fixable=False):
+            out.append(Violation(code, collection, rid, msg, competition_id=cid, index=idx, fixable=fixable))
+
+        regs: Dict[str, Tuple] = {}
+        for r in part["registrations"]:
+            idx, rid, pid, cat, status, slot_id = r
+            if rid in regs:
+                add("duplicate_id", "registrations", rid, "id pendaftaran dipakai lebih dari sekali", idx, True)
+                if status == RegistrationStatus.SCHEDULED.value:
+                    # slot milik id ini sudah dihitung untuk record pertama
+                    add("scheduled_without_slot", "registrations", rid, "id ganda, slot tidak bisa dipastikan", idx, True)
+                continue
+            regs[rid] = r
+            if pid not in user_ids:
+                add("unknown_participant", "registrations", rid, f"peserta {pid} tidak ada", idx)
+            if cat not in comp.get("categories", {}):
+                add("unknown_category", "registrations", rid, f"kategori {cat} tidak ada", idx)
+
+        # pass 1: slot yang sudah cocok dengan pendaftarannya; slot ber-id ganda
+        # diberi id baru, dan tetap milik pendaftaran yang menunjuknya
+        slot_ids: set = set()
+        slot_by_reg: Dict[str, Tuple] = {}
+        unmatched: List[Tuple] = []
+        for s in part["schedule_slots"]:
+            idx, sid, reg_id = s
+            if sid in slot_ids:
+                add("duplicate_id", "schedule_slots", sid, "id slot dipakai lebih dari sekali", idx, True)
+            slot_ids.add(sid)
+            reg = regs.get(reg_id)
+            if reg is not None and reg[4] == RegistrationStatus.SCHEDULED.value and reg[5] == sid and reg_id not in slot_by_reg:
+                slot_by_reg[reg_id] = s
+            else:
+                unmatched.append(s)
+
+        # pass 2: slot yang menunjuk pendaftaran nyata dihubungkan ulang, bukan dihapus
+        relink: set = set()
+        for idx, sid, reg_id in unmatched:
+            reg = regs.get(reg_id)
+            if reg is None:
+                add("slot_orphan", "schedule_slots", sid, f"pendaftaran {reg_id} tidak ada", idx, True)
+            elif reg_id in slot_by_reg or reg_id in relink:
+                # tidak dirujuk pendaftaran mana pun, jadi aman dihapus
+                add("slot_mismatch", "schedule_slots", sid, f"pendaftaran {reg_id} sudah punya slot lain", idx, True)
+            elif reg[4] in (RegistrationStatus.VERIFIED.value, RegistrationStatus.SCHEDULED.value):
+                # slot sudah dibuat tapi update pendaftaran tidak tersimpan
+                relink.add(reg_id)
+                add("slot_unlinked", "schedule_slots", sid, f"pendaftaran {reg_id} belum menunjuk slot ini", idx, True)
+            else:
+                add("slot_mismatch", "schedule_slots", sid, f"pendaftaran {reg_id} berstatus {reg[4]}", idx)
+
+        for rid, (idx, _, _, _, status, slot_id) in regs.items():
+            if status == RegistrationStatus.SCHEDULED.value and rid not in slot_by_reg and rid not in relink:
+                add("scheduled_without_slot", "registrations", rid, f"status scheduled tapi slot {slot_id} tidak cocok", idx, True)
+
+        seen_pairs = {}
+        score_ids = set()
+        for sc in part["scores"]:
+            idx, scid, reg_id, judge_id = sc
+            if scid in score_ids:
+                add("duplicate_id", "scores", scid, "id nilai dipakai lebih dari sekali", idx, True)
+            score_ids.add(scid)
+            reg = regs.get(reg_id)
+            if reg is None:
+                add("score_orphan", "scores", scid, f"pendaftaran {reg_id} tidak ada", idx, True)
+                continue
+            if reg_id not in slot_by_reg and reg_id not in relink:
+                add("score_unscheduled", "scores", scid, f"pendaftaran {reg_id} belum dijadwalkan", idx)
+            pair = (reg_id, judge_id)
+            if pair in seen_pairs:
+                # yang lama dibuang, upsert terakhir yang dipertahankan
+                add("score_duplicate", "scores", seen_pairs[pair][1], f"juri {judge_id} menilai {reg_id} lebih dari sekali", seen_pairs[pair][0], True)
+            seen_pairs[pair] = (idx, scid)
+
+        actual: Dict[str, int] = {}
+        for _, _, _, cat, status, _ in regs.values():
+            if status != RegistrationStatus.REJECTED.value:
+                actual[cat] = actual.get(cat, 0) + 1
+        for cat in set(actual) | set(quota):
+            if int(quota.get(cat, 0)) != actual.get(cat, 0):
+                add("quota_counter_mismatch", "quota", cat, f"counter {quota.get(cat, 0)}, sebenarnya {actual.get(cat, 0)}", fixable=True)
+        for cat, n in actual.items():
+            limit = comp.get("categories", {}).get(cat, {}).get("quota")
+            if limit is not None and n > limit:
+                add("quota_exceeded", "quota", cat, f"{n} pendaftar melebihi kuota {limit}")
+        return out
+
+    def _apply_fix(self, db: Dict[str, Any], regs: Dict[Tuple[str, str], Dict[str, Any]], v: Violation) -> bool:
+        if v.collection == "quota":
+            return self._fix_quota(db["partitions"][v.competition_id], v.id)
+        rec = db["partitions"][v.competition_id][v.collection][v.index]
+
+        if v.code == "duplicate_id" and v.collection == "schedule_slots":
+            self._renumber_slot(db, regs, v, rec)
+        elif v.code == "duplicate_id" and v.collection == "registrations":
+            self._renumber_registration(db, regs, v, rec)
+        elif v.code == "duplicate_id":
+            rec["id"] = self._new_id(db, v.collection)
+        elif v.code in ("slot_orphan", "slot_mismatch", "score_orphan", "score_duplicate"):
+            rec["__hapus"] = True
+        elif v.code == "slot_unlinked":
+            reg = regs[(v.competition_id, rec["registration_id"])]
+            self._set_schedule(db, v, reg, RegistrationStatus.SCHEDULED, rec["id"])
+        elif v.code == "scheduled_without_slot":
+            self._set_schedule(db, v, rec, RegistrationStatus.VERIFIED, None)
+        else:
+            return False
+        return True
+
+    def _set_schedule(self, db: Dict[str, Any], v: Violation, reg: Dict[str, Any], status: RegistrationStatus, slot_id: Optional[str]) -> None:
+        # perubahan status lewat repair juga masuk change feed, di commit yang sama
+        reg["status"] = status.value
+        reg["schedule_slot_id"] = slot_id
+        if status == RegistrationStatus.SCHEDULED:
+            event = (EventType.REGISTRATION_SCHEDULED, {"status": status.value, "schedule_slot_id": slot_id, "repair": v.code})
+        else:
+            event = (EventType.REGISTRATION_VERIFIED, {"status": status.value, "verified_at": reg.get("verified_at"), "repair": v.code})
+        _append_events(db, reg["id"], [event], v.competition_id)
+
+    def _new_id(self, db: Dict[str, Any], collection: str) -> str:
+        # counter bisa tertinggal dari data (itulah asal id ganda), jadi id terpakai dilewati
+        used = {r["id"] for part in db["partitions"].values() for r in part[collection]}
+        ids = IdGenerator(_PREFIX[collection])
+        new_id = ids.new_id(db)
+        while new_id in used:
+            new_id = ids.new_id(db)
+        return new_id
+
+    def _renumber_slot(self, db: Dict[str, Any], regs: Dict[Tuple[str, str], Dict[str, Any]], v: Violation, rec: Dict[str, Any]) -> None:
+        cid = v.competition_id
+        old_id = rec["id"]
+        rec["id"] = self._new_id(db, "schedule_slots")
+        # salinan pertama bisa ada di kompetisi lain; pendaftaran hanya merujuk
+        # slot di partisinya sendiri
+        first = next((s for s in db["partitions"][cid]["schedule_slots"] if s["id"] == old_id), None)
+        reg = regs.get((cid, rec["registration_id"]))
+        # id lama tetap milik pendaftaran slot pertama; pendaftaran lain ikut pindah
+        if reg is not None and reg["schedule_slot_id"] == old_id and (first is None or first["registration_id"] != reg["id"]):
+            self._set_schedule(db, v, reg, RegistrationStatus(reg["status"]), rec["id"])
+
+    def _renumber_registration(self, db: Dict[str, Any], regs: Dict[Tuple[str, str], Dict[str, Any]], v: Violation, rec: Dict[str, Any]) -> None:
+        cid = v.competition_id
+        part = db["partitions"][cid]
+        old_id = rec["id"]
+        rec["id"] = self._new_id(db, "registrations")
+        if regs.get((cid, old_id)) is not rec:
+            # id ganda di partisi yang sama: slot dan nilai tetap milik record pertama
+            return
+        # id ganda lintas kompetisi: slot dan nilai di partisi ini ikut id baru
+        del regs[(cid, old_id)]
+        regs[(cid, rec["id"])] = rec
+        for name in ("schedule_slots", "scores"):
+            for r in part[name]:
+                if r["registration_id"] == old_id:
+                    r["registration_id"] = rec["id"]
+
+    def _fix_quota(self, part: Dict[str, Any], category_id: str) -> bool:
+        part["quota"][category_id] = sum(
+            1 for r in part["registrations"]
+            if r["category_id"] == category_id and r["status"] != RegistrationStatus.REJECTED.value
+        )
+        return True
+
+    def _drop_marked(self, db: Dict[str, Any]) -> None:
+        # dihapus di akhir supaya index pelanggaran lain tetap valid saat perbaikan
+        for part in db["partitions"].values():
+            for name in ("schedule_slots", "scores"):
+                part[name] = [r for r in part[name] if not r.get("__hapus")]
+
+def to_report(violations: List[Violation]) -> Dict[str, Any]:
+    summary: Dict[str, int] = {}
+    for v in violations:
+        summary[v.code] = summary.get(v.code, 0) + 1
+    return {
+        "violations": [asdict(v) for v in violations],
+        "summary": {"total": len(violations), "fixed": sum(v.fixed for v in violations), "by_code": summary},
+    }
\ No newline at end of file
@@ -30,16 +30,22 @@ class ScoringService:
         self.scores.upsert(score)
         return score
 
+    def _pinned(self):
+        # satu snapshot untuk seluruh laporan: nilai yang masuk di tengah jalan tidak tercampur
+        snap = self.scores.store.snapshot()
+        return self.regs.pinned(snap), self.scores.pinned(snap), self.users.pinned(snap)
+
     def get_unscored_scheduled(self, judge_id: str):
         from domain.enumerasi import RegistrationStatus
-        all_scheduled = self.regs.list_by_status(RegistrationStatus.SCHEDULED)
-        all_scores = self.scores.list_all()
+        regs, scores, users = self._pinned()
+        all_scheduled = regs.list_by_status(RegistrationStatus.SCHEDULED)
+        all_scores = scores.list_all()
         
         unscored = []
         for reg in all_scheduled:
             already_scored = any(s.registration_id == reg.id and s.judge_id == judge_id for s in all_scores)
             if not already_scored:
-                participant = self.users.get(reg.participant_id)
+                participant = users.get(reg.participant_id)
                 name = participant.profile.full_name if hasattr(participant, 'profile') else participant.username
                 unscored.append({
                     "reg_id": reg.id,
@@ -49,7 +55,8 @@ class ScoringService:
         return unscored
 
     def ranking(self):
-        all_scores = self.scores.list_all()
+        regs, scores, users = self._pinned()
+        all_scores = scores.list_all()
         by_reg = {}
         for s in all_scores:
             by_reg.setdefault(s.registration_id, []).append(s.total(DEFAULT_WEIGHTS))
@@ -57,8 +64,8 @@ class ScoringService:
         result = []
         for reg_id, totals in by_reg.items():
             avg = sum(totals) / len(totals)
-            reg = self.regs.get(reg_id)
-            participant = self.users.get(reg.participant_id)
+            reg = regs.get(reg_id)
+            participant = users.get(reg.participant_id)
             name = participant.profile.full_name if hasattr(participant, 'profile') else participant.username
             result.append((reg_id, name, avg, len(totals)))
             
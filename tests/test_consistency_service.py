@@ -0,0 +1,104 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from core.konstanta import SCHEMA_VERSION
+from infrastruktur.penyimpanan_json import JsonStore
+from services.consistency_service import ConsistencyService
+
+def _partition(user_id):
+    return {
+        "registrations": [{"id": "reg_0001", "participant_id": user_id, "category_id": "cat", "status": "scheduled", "schedule_slot_id": "slot_0001"}],
+        "schedule_slots": [{"id": "slot_0001", "registration_id": "reg_0001"}],
+        "scores": [{"id": "score_0001", "registration_id": "reg_0001", "judge_id": "user_0003", "score": 80}],
+        "quota": {"cat": 1},
+    }
+
+def _competition(cid):
+    return {"id": cid, "name": cid, "location": "", "date": "", "deadline": "", "archived": False,
+            "categories": {"cat": {"id": "cat", "name": "cat", "min_age": 7, "max_age": 35, "fee": 0, "quota": 10}}}
+
+def _doc():
+    # dua kompetisi dengan counter id yang tertinggal: id yang sama dipakai di keduanya
+    return {
+        "__schema_version": SCHEMA_VERSION,
+        "users": [{"id": "user_0001", "username": "a"}, {"id": "user_0002", "username": "b"}, {"id": "user_0003", "username": "juri"}],
+        "competitions": {"comp_0001": _competition("comp_0001"), "comp_0002": _competition("comp_0002")},
+        "active_competition": "comp_0001",
+        "partitions": {"comp_0001": _partition("user_0001"), "comp_0002": _partition("user_0002")},
+        "events": [],
+        "__counter_reg": 1, "__counter_slot": 1, "__counter_score": 1, "__counter_user": 3,
+    }
+
+class ConsistencyServiceTwoPartitions(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "db.json"
+        self.store = JsonStore(self.path)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, doc):
+        self.path.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def _service(self):
+        return ConsistencyService(self.store, workers=1)
+
+    def test_check_reports_cross_partition_duplicates_once(self):
+        self._write(_doc())
+        found = [(v.code, v.collection, v.competition_id, v.fixable) for v in self._service().check()]
+        self.assertEqual(sorted(found), [
+            ("duplicate_id", "registrations", "comp_0002", True),
+            ("duplicate_id", "schedule_slots", "comp_0002", True),
+            ("duplicate_id", "scores", "comp_0002", True),
+        ])
+
+    def test_repair_keeps_slots_and_scores_of_renumbered_records(self):
+        self._write(_doc())
+        violations = self._service().repair()
+        self.assertTrue(all(v.fixed for v in violations))
+        # run kedua harus bersih: tidak ada slot/nilai yang jadi yatim lalu dihapus
+        self.assertEqual(self._service().check(), [])
+
+        db = json.loads(self.path.read_text(encoding="utf-8"))
+        part = db["partitions"]["comp_0002"]
+        reg, slot, score = part["registrations"][0], part["schedule_slots"][0], part["scores"][0]
+        self.assertNotEqual(reg["id"], "reg_0001")
+        self.assertNotEqual(slot["id"], "slot_0001")
+        self.assertEqual(reg["status"], "scheduled")
+        self.assertEqual(reg["schedule_slot_id"], slot["id"])
+        self.assertEqual(slot["registration_id"], reg["id"])
+        self.assertEqual(score["registration_id"], reg["id"])
+        self.assertEqual(db["partitions"]["comp_0001"], _partition("user_0001"))
+
+        self._service().repair()
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")), db)
+
+    def test_duplicate_slot_in_same_partition_is_relinked(self):
+        doc = _doc()
+        part = doc["partitions"]["comp_0001"]
+        part["registrations"].append({"id": "reg_0009", "participant_id": "user_0002", "category_id": "cat", "status": "scheduled", "schedule_slot_id": "slot_0001"})
+        part["schedule_slots"].append({"id": "slot_0001", "registration_id": "reg_0009"})
+        part["quota"]["cat"] = 2
+        del doc["partitions"]["comp_0002"]
+        self._write(doc)
+        self._service().repair()
+        self.assertEqual(self._service().check(), [])
+        regs = json.loads(self.path.read_text(encoding="utf-8"))["partitions"]["comp_0001"]["registrations"]
+        self.assertEqual(regs[0]["schedule_slot_id"], "slot_0001")
+        self.assertNotEqual(regs[1]["schedule_slot_id"], "slot_0001")
+        self.assertEqual(regs[1]["status"], "scheduled")
+
+    def test_duplicate_user_id_is_report_only(self):
+        doc = _doc()
+        doc["users"][1]["id"] = "user_0001"
+        del doc["partitions"]["comp_0002"]
+        self._write(doc)
+        violations = self._service().repair()
+        users = [v for v in violations if v.collection == "users"]
+        self.assertEqual([(v.code, v.fixable, v.fixed) for v in users], [("duplicate_id", False, False)])
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")), doc)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
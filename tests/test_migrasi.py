@@ -0,0 +1,98 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import infrastruktur.migrasi as migrasi
+from app.data_awal import prepare_store
+from core.konstanta import SCHEMA_VERSION
+from infrastruktur.penyimpanan_json import JsonStore
+
+class _Putus(Exception):
+    pass
+
+def _doc_v0(n=40):
+    # bentuk db sebelum ada penanda versi: satu kompetisi di top-level
+    return {
+        "users": [
+            {"id": f"user_{i:04d}", "username": f"u{i}", "role": "participant", "profile": {"full_name": f"Peserta ü {i}", "age": str(10 + i)}}
+            for i in range(1, n + 1)
+        ],
+        "competition": {"id": "comp_0001", "name": "Lomba", "location": "Jakarta", "date": "2026-02-01", "deadline": "2026-01-20",
+                        "categories": {"cat_anak": {"id": "cat_anak", "name": "Anak", "min_age": 7, "max_age": 12, "fee": 50000, "quota": 50}}},
+        "registrations": [
+            {"id": f"reg_{i:04d}", "participant_id": f"user_{i:04d}", "category_id": "cat_anak", "status": "rejected" if i % 5 == 0 else "submitted"}
+            for i in range(1, n + 1)
+        ],
+        "schedule_slots": [],
+        "scores": [{"id": "score_0001", "registration_id": "reg_0001", "judge_id": "user_0002", "score": 90}],
+    }
+
+class MigrasiResume(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.path = self.dir / "db.json"
+        self.path.write_text(json.dumps(_doc_v0(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _migrate_copy(self):
+        ref = self.dir / "ref" / "db.json"
+        ref.parent.mkdir()
+        shutil.copy2(self.path, ref)
+        self.assertEqual(migrasi.migrate(ref, checkpoint_every=7), (0, SCHEMA_VERSION))
+        return ref.read_bytes()
+
+    def test_resume_after_interrupt_is_byte_identical(self):
+        expected = self._migrate_copy()
+        save = migrasi._StreamingMigration._save_checkpoint
+        saved = []
+
+        def crash(self):
+            save(self)
+            saved.append(self.count)
+            if len(saved) == 3:
+                raise _Putus()
+
+        with mock.patch.object(migrasi._StreamingMigration, "_save_checkpoint", crash):
+            with self.assertRaises(_Putus):
+                migrasi.migrate(self.path, checkpoint_every=7)
+        self.assertTrue(self.path.with_suffix(".migrasi.json").exists())
+        self.assertIsNone(json.loads(self.path.read_text(encoding="utf-8")).get("__schema_version"))
+
+        self.assertEqual(migrasi.migrate(self.path, checkpoint_every=7), (0, SCHEMA_VERSION))
+        self.assertEqual(self.path.read_bytes(), expected)
+        self.assertFalse(self.path.with_suffix(".migrasi.json").exists())
+        self.assertFalse(self.path.with_suffix(".migrasi.tmp").exists())
+        self.assertIsNone(migrasi.migrate(self.path))
+
+    def test_migrated_document_matches_v2_shape(self):
+        migrasi.migrate(self.path, checkpoint_every=7)
+        db = json.loads(self.path.read_text(encoding="utf-8"))
+        self.assertEqual(db["__schema_version"], SCHEMA_VERSION)
+        part = db["partitions"]["comp_0001"]
+        self.assertEqual(part["quota"], {"cat_anak": 32})
+        self.assertEqual(len(part["registrations"]), 40)
+        self.assertEqual(db["users"][0]["profile"], {"full_name": "Peserta ü 1", "age": 11, "phone": ""})
+        self.assertIsNone(part["registrations"][0]["payment"])
+        self.assertEqual(db["events"], [])
+
+    def test_prepare_store_releases_reader_before_migrating(self):
+        store = JsonStore(self.path)
+        migrate = migrasi.migrate
+
+        def checked(path, *args, **kwargs):
+            # db.json akan diganti: store tidak boleh masih memegang mmap-nya
+            self.assertIsNone(store._snapshot)
+            return migrate(path, *args, **kwargs)
+
+        with mock.patch.object(migrasi, "migrate", checked), mock.patch("app.data_awal.seed_all"):
+            prepare_store(store)
+        self.assertEqual(store.read_path(("__schema_version",)), SCHEMA_VERSION)
+        self.assertEqual(store.count_path(("partitions", "comp_0001", "registrations")), 40)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+from pathlib import Path
+from app.data_awal import seed_all
+from app.konteks import build_context
+from app.operasi import run_op
+from infrastruktur.penyimpanan_json import JsonStore
+
+class RunOpErrors(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = JsonStore(Path(self._tmp.name) / "db.json")
+        seed_all(self.store)
+        self.ctx = build_context(self.store)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, **op):
+        with self.store.session():
+            return run_op(self.ctx, op)
+
+    def test_bad_arguments_are_validation_errors(self):
+        for op in (
+            {"op": "events", "since": "x"},
+            {"op": "list_by_status", "status": "entah"},
+            {"op": "score", "reg_id": "reg_0001", "judge_id": "user_0002", "vocal": "9a", "intonation": 1, "stage": 1},
+            {"op": "create_registration", "participant_id": "user_0001", "category_id": "cat_anak", "song_title": "x", "today": "kemarin"},
+        ):
+            with self.subTest(op=op["op"]):
+                res = self._run(**op)
+                self.assertEqual((res["status"], res["error_type"]), ("error", "ValidationError"), res)
+
+    def test_invalid_transition_is_reported_as_input_error(self):
+        user = self._run(op="register", username="peserta", password="rahasia", full_name="P", age=10)["result"]
+        reg = self._run(op="create_registration", participant_id=user["id"], category_id="cat_anak", song_title="Lagu", today="2026-01-01")["result"]
+        res = self._run(op="verify", reg_id=reg["id"])
+        self.assertEqual((res["status"], res["error_type"]), ("error", "TransitionError"), res)
+
+    def test_corrupt_db_is_a_system_error(self):
+        self.store.release()
+        self.store.path.write_text('["bukan objek"]', encoding="utf-8")
+        res = run_op(self.ctx, {"op": "ranking"})
+        self.assertEqual(res["status"], "error")
+        self.assertNotIn(res["error_type"], ("ValidationError", "TransitionError"))
+        self.assertTrue(res["error"].startswith("kesalahan sistem"), res)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
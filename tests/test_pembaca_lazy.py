@@ -0,0 +1,109 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import infrastruktur.pembaca_lazy as pembaca_lazy
+from infrastruktur.pembaca_lazy import LazyJsonReader
+
+# jendela kecil supaya elemen, escape, dan karakter multi-byte terpotong di batas jendela
+CHUNKS = (4, 7, 13, 31, 64, 1 << 20)
+
+def _doc():
+    return {
+        "__schema_version": 2,
+        "users": [
+            {"id": f"user_{i:04d}", "username": f"u{i}", "aktif": i != 3, "profile": {"full_name": "Nabhita Aurellia ü é 漢字 😀", "age": 20 + i}}
+            for i in range(12)
+        ],
+        "kosong": [],
+        "angka": [0.0015, 12.5e-3, 1E5, -0.25, 3, -7, 1.5e-10, 0],
+        "campuran": ["a\"b", "back\\slash", "baris\nbaru", "tab\t", "\u0000", True, False, None, [1, [2, {"x": "]"}]], {"}": "{"}],
+        "besar": [{"id": "big", "teks": "x" * 300 + "ü" * 100}],
+        "partitions": {"c1": {"registrations": [{"id": f"reg_{i}", "status": "verified"} for i in range(30)], "quota": {"cat": 30}}},
+    }
+
+class LazyJsonReaderRoundTrip(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "db.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, doc, indent=2):
+        self.path.write_text(json.dumps(doc, ensure_ascii=False, indent=indent), encoding="utf-8")
+
+    def _assert_matches(self, reader, doc, path=()):
+        node = doc
+        for key in path:
+            node = node[key]
+        if isinstance(node, list):
+            self.assertEqual(reader.count(path), len(node), path)
+            self.assertEqual(list(reader.iter_items(path)), node, path)
+            for i, item in enumerate(node):
+                self.assertEqual(reader.get(path + (i,)), item, path + (i,))
+        elif isinstance(node, dict):
+            self.assertEqual(reader.keys(path), list(node), path)
+            for key in node:
+                self._assert_matches(reader, doc, path + (key,))
+        else:
+            self.assertEqual(reader.get(path), node, path)
+
+    def test_round_trip_against_json_load(self):
+        for indent in (None, 2):
+            self._write(_doc(), indent)
+            expected = json.loads(self.path.read_text(encoding="utf-8"))
+            for chunk in CHUNKS:
+                with self.subTest(indent=indent, chunk=chunk), mock.patch.object(pembaca_lazy, "_CHUNK", chunk):
+                    reader = LazyJsonReader(self.path)
+                    try:
+                        self._assert_matches(reader, expected)
+                        self.assertEqual(reader.get(()), expected)
+                    finally:
+                        reader.close()
+
+    def test_find_uses_index_and_scan(self):
+        self._write(_doc())
+        reader = LazyJsonReader(self.path)
+        try:
+            self.assertEqual(reader.find(("users",), "id", "user_0007")["username"], "u7")
+            self.assertEqual(reader.find(("users",), "username", "u11")["id"], "user_0011")
+            self.assertIsNone(reader.find(("users",), "id", "user_9999"))
+            self.assertIsNone(reader.find(("kosong",), "id", "x"))
+            # bool tidak masuk indeks, dicari dengan pemindaian
+            self.assertEqual(reader.find(("users",), "aktif", False)["id"], "user_0003")
+        finally:
+            reader.close()
+
+    def test_layout_reuse_matches_fresh_scan(self):
+        doc = _doc()
+        self._write(doc)
+        with mock.patch.object(pembaca_lazy, "_CHUNK", 13):
+            old = LazyJsonReader(self.path)
+            old.find(("users",), "id", "user_0001")
+            layout = old.list_layout()
+            old.close()
+
+            # users bertambah di belakang, registrations berubah di tengah, angka terakhir diperpanjang
+            doc["users"].append({"id": "user_0100", "username": "baru", "aktif": True, "profile": {"full_name": "ü", "age": 30}})
+            doc["partitions"]["c1"]["registrations"][5]["status"] = "scheduled"
+            doc["angka"][-1] = 12
+            doc["__schema_version"] = 3
+            self._write(doc)
+
+            reused = LazyJsonReader(self.path, layout)
+            fresh = LazyJsonReader(self.path)
+            try:
+                self.assertEqual(reused._items.keys(), fresh._items.keys())
+                for path, (starts, ends) in fresh._items.items():
+                    self.assertEqual(reused._items[path], (starts, ends), path)
+                self._assert_matches(reused, doc)
+                self.assertEqual(reused.find(("users",), "id", "user_0100")["username"], "baru")
+                self.assertEqual(reused.find(("users",), "id", "user_0001")["username"], "u1")
+            finally:
+                reused.close()
+                fresh.close()
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import infrastruktur.pembaca_lazy as pembaca_lazy
+from infrastruktur.penyimpanan_json import JsonStore
+
+class SnapshotAcrossCommit(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = JsonStore(Path(self._tmp.name) / "db.json")
+        self.store.write({"users": [{"id": "user_0001"}], "partitions": {}})
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_pinned_snapshot_keeps_old_version(self):
+        # False: jalur Windows, pembaca tidak memegang mmap file yang akan diganti
+        for use_mmap in (True, False):
+            with self.subTest(use_mmap=use_mmap), mock.patch.object(pembaca_lazy, "_USE_MMAP", use_mmap):
+                self.store.release()
+                old = self.store.snapshot()
+                self.assertEqual(isinstance(old.reader._mm, bytes), not use_mmap)
+                n = old.count_path(("users",))
+                with self.store.session():
+                    db = self.store.read()
+                    db["users"].append({"id": f"user_{n + 1:04d}"})
+                    self.store.write(db)
+                self.assertEqual(old.count_path(("users",)), n)
+                self.assertEqual(old.read_path(("users", n - 1)), {"id": f"user_{n:04d}"})
+                self.assertEqual(self.store.count_path(("users",)), n + 1)
+                self.assertEqual(self.store.find_in(("users",), "id", f"user_{n + 1:04d}"), {"id": f"user_{n + 1:04d}"})
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,55 @@
+import asyncio
+import json
+import unittest
+from app.server_http import ServerHttp
+
+class _Layanan:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    async def execute(self, op):
+        self.calls.append(op)
+        if self.fail:
+            raise OSError("disk penuh")
+        return {"op": op["op"], "status": "ok", "result": None}
+
+async def _request(layanan, raw: bytes):
+    server = await asyncio.start_server(ServerHttp(layanan).handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body) if body else None
+
+def _post(path: str, args) -> bytes:
+    body = json.dumps(args).encode("utf-8")
+    return f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+
+class ServerHttpResponses(unittest.TestCase):
+    def test_failed_execute_answers_500(self):
+        status, payload = asyncio.run(_request(_Layanan(fail=True), _post("/ops/verify", {"reg_id": "reg_0001"})))
+        self.assertEqual(status, 500)
+        self.assertEqual(payload["status"], "error")
+        self.assertIn("disk penuh", payload["error"])
+
+    def test_login_is_post_only(self):
+        layanan = _Layanan()
+        raw = b"GET /ops/login?username=a&password=rahasia HTTP/1.1\r\nConnection: close\r\n\r\n"
+        status, _ = asyncio.run(_request(layanan, raw))
+        self.assertEqual(status, 405)
+        self.assertEqual(layanan.calls, [])
+        status, _ = asyncio.run(_request(layanan, _post("/ops/login", {"username": "a", "password": "rahasia"})))
+        self.assertEqual(status, 200)
+
+    def test_bad_content_length_answers_400(self):
+        raw = b"POST /ops/verify HTTP/1.1\r\nContent-Length: -1\r\n\r\n"
+        status, _ = asyncio.run(_request(_Layanan(), raw))
+        self.assertEqual(status, 400)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file